@@ -7,30 +7,48 @@
 
 """
 
+import copy
+import cProfile
 import functools
+import glob
+import hashlib
+import inspect
 import os
 import json
+import pickle
+import posixpath
+import re
+import time
 
 from typing import Any
 
-from urllib.parse import urlsplit
-from urllib.request import urlopen
+from urllib.error import HTTPError
+from urllib.parse import urldefrag, urljoin, urlsplit
+from urllib.request import Request, urlopen
 
 from ruamel.yaml import YAML
 import jsonschema
+import pygments
+import sphinx
 import collections
 import collections.abc
+import concurrent.futures
+import multiprocessing
 from contextlib import closing
 
 from sphinx.util import logging
+from sphinx.util.parallel import parallel_available
 import pbr.version
 
 from docutils import nodes
+from docutils.statemachine import StringList
 
 from docutils.parsers.rst import directives
+from sphinx.transforms.post_transforms import SphinxPostTransform
 from sphinx.util.docutils import SphinxDirective
-from sphinx.util.osutil import copyfile
+from sphinx.util.osutil import copyfile, relative_uri
 
+import myst_parser
 from myst_parser.mdit_to_docutils.base import make_document
 from myst_parser.parsers.docutils_ import (
     Parser,
@@ -41,15 +59,404 @@ __version__ = pbr.version.VersionInfo("os_openapi").version_string()
 LOG = logging.getLogger(__name__)
 
 
-# Locally cache spec to speedup processing of same spec file in multiple
-# openapi directives
-@functools.lru_cache()
-def _get_spec(abspath, encoding):
-    with open(abspath, "rt", encoding=encoding) as stream:
-        # It is important to use ruamel since it goes for YAML1.2 which
-        # properly understands quotes for nova boolean enum values
-        yaml = YAML(typ="safe")
-        return yaml.load(stream)
+# Profile of the build when `openapi_profile` is enabled and the spec
+# currently being rendered. Timings are collected per spec and phase
+# together with timings of the single operations.
+_PROFILE: dict[str, Any] | None = None
+_PROFILE_SPEC: str | None = None
+
+
+def _reset_profile_in_child():
+    """Start a fresh profile in the forked process
+
+    Profiles of the parallel readers are merged into the profile of the
+    main process, so they must not carry the timings inherited from it.
+    """
+    global _PROFILE
+    if _PROFILE is not None:
+        _PROFILE = {"phases": {}, "operations": []}
+
+
+os.register_at_fork(after_in_child=_reset_profile_in_child)
+
+# Number of the slowest operations reported in the profile
+PROFILE_SLOWEST = 10
+
+
+def _profiled(phase, operation=None, spec=None):
+    """Collect cumulative time of the function in the profile
+
+    :param phase: Name of the phase in the profile.
+    :param operation: Callable returning the operationId from the call
+        arguments. Timings of the single operations are recorded then.
+    :param spec: Callable returning the spec name from the call arguments.
+        The spec currently being rendered is used by default.
+    """
+
+    def record(start, args):
+        elapsed = time.perf_counter() - start
+        spec_name = (spec(*args) if spec else _PROFILE_SPEC) or "-"
+        entry = _PROFILE["phases"].setdefault((spec_name, phase), [0, 0.0])
+        entry[0] += 1
+        entry[1] += elapsed
+        if operation:
+            _PROFILE["operations"].append(
+                (elapsed, spec_name, operation(*args))
+            )
+
+    def decorator(func):
+        if inspect.isgeneratorfunction(func):
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if _PROFILE is None:
+                    yield from func(*args, **kwargs)
+                    return
+                start = time.perf_counter()
+                try:
+                    yield from func(*args, **kwargs)
+                finally:
+                    record(start, args)
+
+        else:
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if _PROFILE is None:
+                    return func(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    record(start, args)
+
+        return wrapper
+
+    return decorator
+
+
+def _merge_profile(profile, other):
+    """Merge timings of the `other` profile into the `profile`"""
+    for key, (calls, elapsed) in other["phases"].items():
+        entry = profile["phases"].setdefault(key, [0, 0.0])
+        entry[0] += calls
+        entry[1] += elapsed
+    profile["operations"].extend(other["operations"])
+
+
+class _MemoryBoundedCache:
+    """LRU cache evicting entries by their total estimated memory
+
+    :param max_memory: Maximal total estimated memory of the entries. The
+        most recently used entry is kept even when it alone exceeds it.
+    :param on_evict: Callable receiving values of the evicted entries.
+    """
+
+    def __init__(self, max_memory, on_evict=None):
+        self.max_memory = max_memory
+        self.on_evict = on_evict
+        self.memory = 0
+        self._entries: collections.OrderedDict[Any, tuple[Any, int]] = (
+            collections.OrderedDict()
+        )
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, default=None):
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key, value, size):
+        """Add the entry of the given estimated memory size"""
+        if key in self._entries:
+            self.memory -= self._entries.pop(key)[1]
+        self._entries[key] = (value, size)
+        self.memory += size
+        while self.memory > self.max_memory and len(self._entries) > 1:
+            _, (evicted, evicted_size) = self._entries.popitem(last=False)
+            self.memory -= evicted_size
+            if self.on_evict:
+                self.on_evict(evicted)
+
+
+# Maximal estimated memory of the parsed and of the normalized specs kept in
+# memory, and the estimated memory of the spec relative to its file size
+SPEC_CACHE_MEMORY = 256 * 2**20
+SPEC_MEMORY_FACTOR = 3
+
+# Parsed specs are cached in-process (to speedup processing of same spec
+# file in multiple openapi directives) and persisted on disk under the Sphinx
+# doctree directory, so that incremental builds skip YAML parsing of specs
+# which have not changed. Both caches are keyed by the spec content hash.
+_SPEC_CACHE = _MemoryBoundedCache(SPEC_CACHE_MEMORY)
+
+# Content hash of the spec files by their real path together with the mtime,
+# size and inode of the file the hash was computed for
+_SPEC_KEYS: dict[str, tuple[tuple, str, int]] = {}
+
+
+def _get_spec_cache_key(data: bytes, encoding: str | None) -> str:
+    """Build the cache key of the spec from its raw content"""
+    digest = hashlib.sha256(data)
+    digest.update(f"{__version__}:{encoding}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+try:
+    import yaml as pyyaml
+
+    _CSafeLoader = pyyaml.CSafeLoader
+except (ImportError, AttributeError):
+    _CSafeLoader = None
+
+if _CSafeLoader:
+
+    class _CoreSchemaLoader(_CSafeLoader):
+        """libyaml based loader resolving scalars the YAML 1.2 way
+
+        PyYAML implements YAML 1.1 where e.g. `on` or `no` are booleans,
+        so the plain scalars are resolved with the YAML 1.2 core schema
+        instead, the same way ruamel does.
+        """
+
+        pass
+
+    # Timestamps and merge keys are resolved like in YAML 1.1
+    _CoreSchemaLoader.yaml_implicit_resolvers = {
+        first: [
+            (tag, regexp)
+            for tag, regexp in resolvers
+            if tag.rsplit(":", 1)[1] in ("timestamp", "merge")
+        ]
+        for first, resolvers in _CSafeLoader.yaml_implicit_resolvers.items()
+    }
+    # Same patterns as of the YAML 1.2 resolver of ruamel
+    for _tag, _regexp, _first in [
+        ("bool", r"^(?:true|True|TRUE|false|False|FALSE)$", "tTfF"),
+        (
+            "float",
+            r"""^(?:
+             [-+]?(?:[0-9][0-9_]*)\.[0-9_]*(?:[eE][-+]?[0-9]+)?
+            |[-+]?(?:[0-9][0-9_]*)(?:[eE][-+]?[0-9]+)
+            |[-+]?\.[0-9_]+(?:[eE][-+][0-9]+)?
+            |[-+]?\.(?:inf|Inf|INF)
+            |\.(?:nan|NaN|NAN))$""",
+            "-+0123456789.",
+        ),
+        (
+            "int",
+            r"""^(?:[-+]?0b[0-1_]+
+            |[-+]?0o?[0-7_]+
+            |[-+]?[0-9_]+
+            |[-+]?0x[0-9a-fA-F_]+)$""",
+            "-+0123456789",
+        ),
+        ("null", r"^(?:~|null|Null|NULL|)$", ["~", "n", "N", ""]),
+    ]:
+        _CoreSchemaLoader.add_implicit_resolver(
+            f"tag:yaml.org,2002:{_tag}",
+            re.compile(_regexp, re.X),
+            list(_first),
+        )
+
+    def _construct_core_int(loader, node):
+        # YAML 1.2 has no leading zero octals, digits may be separated by
+        # underscores like in ruamel
+        value = loader.construct_scalar(node).replace("_", "")
+        sign = -1 if value[0] == "-" else 1
+        value = value.lstrip("-+")
+        base = {"0b": 2, "0o": 8, "0x": 16}.get(value[:2])
+        if base:
+            return sign * int(value[2:], base)
+        return sign * int(value)
+
+    _CoreSchemaLoader.add_constructor(
+        "tag:yaml.org,2002:int", _construct_core_int
+    )
+
+
+def _get_spec_json_path(abspath):
+    """Path of the pre-converted JSON spec next to the YAML spec"""
+    return os.path.splitext(os.path.realpath(abspath))[0] + ".json"
+
+
+def _load_spec(data: bytes, encoding: str | None, abspath=None):
+    """Parse the spec
+
+    The pre-converted JSON spec (see `tools/convert_specs.py`) is used when
+    it is newer than the YAML spec at `abspath`. Otherwise the spec is
+    parsed with the libyaml loader when available.
+    """
+    if abspath:
+        json_path = _get_spec_json_path(abspath)
+        try:
+            if os.stat(json_path).st_mtime > os.stat(abspath).st_mtime:
+                with open(json_path, "rb") as stream:
+                    return json.load(stream)
+        except FileNotFoundError:
+            pass
+    text = data.decode(encoding or "utf-8")
+    if _CSafeLoader:
+        return pyyaml.load(text, Loader=_CoreSchemaLoader)
+    # It is important to use ruamel since it goes for YAML1.2 which
+    # properly understands quotes for nova boolean enum values
+    yaml = YAML(typ="safe")
+    return yaml.load(text)
+
+
+def _intern_spec(node, strings=None, interned=None):
+    """Share equal strings of the parsed spec
+
+    Keys like "type" or "description" and values like "string" are
+    repeated tens of thousands of times in the specs, but parsers create a
+    new string object for every occurrence. Objects shared by YAML aliases
+    stay shared.
+    """
+    if strings is None:
+        strings = {}
+        interned = {}
+    if isinstance(node, str):
+        return strings.setdefault(node, node)
+    if not isinstance(node, (dict, list)):
+        return node
+    if id(node) in interned:
+        return interned[id(node)]
+    if isinstance(node, dict):
+        result = {
+            _intern_spec(k, strings): _intern_spec(v, strings, interned)
+            for k, v in node.items()
+        }
+    else:
+        result = [_intern_spec(v, strings, interned) for v in node]
+    interned[id(node)] = result
+    return result
+
+
+def _write_atomic(path, data, mode="wb"):
+    """Write `data` to the file replacing it at once
+
+    The data is written to a temporary file first, so that concurrent
+    readers (parallel builds) never see a partially written file. The
+    temporary file is removed when writing it fails.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_file = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(
+            tmp_file, mode, encoding=None if "b" in mode else "utf-8"
+        ) as stream:
+            stream.write(data)
+        os.replace(tmp_file, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_file)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def _read_spec(abspath, encoding):
+    """Read raw spec content and return it together with its cache key"""
+    path = os.path.realpath(abspath)
+    with open(path, "rb") as stream:
+        signature = _get_file_signature(stream.fileno())
+        data = stream.read()
+    key = _get_spec_cache_key(data, encoding)
+    _SPEC_KEYS[path] = ((*signature, encoding), key, len(data))
+    return key, data
+
+
+def _get_file_signature(path_or_fd):
+    """Get mtime, size and inode of the file"""
+    stat = os.stat(path_or_fd)
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+def _get_spec_key(abspath, encoding):
+    """Get the cache key and the size of the spec file
+
+    The file is only read and hashed again when its mtime, size or inode
+    changed. Symlinked specs share the entry of the file they point to.
+
+    :returns: tuple of the key, the size and the content of the file when
+        it was read, None otherwise.
+    """
+    path = os.path.realpath(abspath)
+    cached = _SPEC_KEYS.get(path)
+    if cached and cached[0] == (*_get_file_signature(path), encoding):
+        return cached[1], cached[2], None
+    key, data = _read_spec(path, encoding)
+    return key, len(data), data
+
+
+@_profiled("_get_spec")
+def _get_spec(abspath, encoding, cachedir=None, spec_key=None):
+    """Get the parsed spec
+
+    :param abspath: Absolute path to the spec file.
+    :param encoding: Encoding of the spec file.
+    :param cachedir: Directory to persist parsed specs in. When not set
+        only the in-process cache is used.
+    :param spec_key: Result of `_get_spec_key` when already known, so that
+        the file is not read again.
+    """
+    key, size, data = spec_key or _get_spec_key(abspath, encoding)
+    spec = _SPEC_CACHE.get(key)
+    if spec is not None:
+        return spec
+    size = SPEC_MEMORY_FACTOR * size
+
+    cache_file = None
+    if cachedir:
+        # Pickles are prefixed by the spec path, so that the pickles of the
+        # previous versions of the spec can be found and removed
+        path_prefix = hashlib.sha256(
+            os.path.realpath(abspath).encode("utf-8")
+        ).hexdigest()[:16]
+        cache_file = os.path.join(cachedir, f"{path_prefix}-{key}.pickle")
+        try:
+            with open(cache_file, "rb") as stream:
+                spec = pickle.load(stream)
+        except FileNotFoundError:
+            pass
+        except Exception as ex:
+            LOG.warning("Ignoring broken spec cache %s: %s", cache_file, ex)
+        else:
+            LOG.info("Spec cache hit for %s", abspath)
+            _SPEC_CACHE.put(key, spec, size)
+            return spec
+        LOG.info("Spec cache miss for %s", abspath)
+
+    if data is None:
+        # Only the key was known, the content is read once it is parsed
+        key, data = _read_spec(abspath, encoding)
+        if cache_file:
+            cache_file = os.path.join(cachedir, f"{path_prefix}-{key}.pickle")
+    spec = _intern_spec(_load_spec(data, encoding, abspath))
+    _SPEC_CACHE.put(key, spec, size)
+
+    if cache_file:
+        _write_atomic(
+            cache_file, pickle.dumps(spec, protocol=pickle.HIGHEST_PROTOCOL)
+        )
+        for stale_file in glob.glob(
+            os.path.join(glob.escape(cachedir), f"{path_prefix}-*.pickle")
+        ):
+            if stale_file != cache_file:
+                LOG.info("Removing superseded spec cache %s", stale_file)
+                try:
+                    os.unlink(stale_file)
+                except FileNotFoundError:
+                    # removed by a concurrent reader
+                    pass
+    return spec
 
 
 class openapi(nodes.Part, nodes.Element):
@@ -64,6 +471,71 @@ class openapi_operation_header(nodes.Part, nodes.Element):
     pass
 
 
+class openapi_schema(nodes.General, nodes.Element):
+    """JSON schema placeholder node"""
+
+    pass
+
+
+class openapi_operation_details(nodes.General, nodes.Element):
+    """Operation details loaded on demand node"""
+
+    pass
+
+
+class openapi_operation(nodes.General, nodes.Element):
+    """Operation placeholder node
+
+    Nodes of the operation are moved out of the doctree into the node
+    store of the directive (`store`) under the operation fingerprint
+    (`key`) together with digests of the Markdown fragments of the
+    operation (`markdown`) once the document is read, and are put back by
+    `ExpandOperations` only when the document is written.
+    """
+
+    pass
+
+
+class openapi_response_body(nodes.General, nodes.Element):
+    """Fields table and examples of the response body node
+
+    Bodies of the same schema (`digest`) used repeatedly on the page are
+    moved to a single `openapi_response_template` and rendered as its
+    placeholders.
+    """
+
+    pass
+
+
+class openapi_response_template(nodes.General, nodes.Element):
+    """Response body rendered once per page node"""
+
+    pass
+
+
+class openapi_fields_table(nodes.General, nodes.Element):
+    """Table of the parameters and body fields node
+
+    Name, location and type of the fields are kept as `rows` tuples, only
+    the descriptions are child nodes (`openapi_field_description`).
+    """
+
+    pass
+
+
+class openapi_field_description(nodes.entry):
+    """Description cell of the `openapi_fields_table` node"""
+
+    pass
+
+
+class openapi_code(nodes.General, nodes.Element):
+    """Highlighted code (schema or example) in the `language` with an
+    optional title"""
+
+    pass
+
+
 class OpenApiRefResolver(jsonschema.RefResolver):
     """
     Overrides resolve_remote to support both YAML and JSON
@@ -77,6 +549,16 @@ class OpenApiRefResolver(jsonschema.RefResolver):
     except ImportError:
         _requests = None
 
+    # HTTP session shared by all resolvers to reuse connections
+    _session = None
+
+    @classmethod
+    def get_session(cls):
+        """Get the pooled HTTP session or None without `requests`"""
+        if cls._session is None and cls._requests:
+            cls._session = cls._requests.Session()
+        return cls._session
+
     def resolve_remote(self, uri):
         scheme, _, path, _, _ = urlsplit(uri)
         _, extension = os.path.splitext(path)
@@ -85,7 +567,7 @@ class OpenApiRefResolver(jsonschema.RefResolver):
             return super(OpenApiRefResolver, self).resolve_remote(uri)
 
         if scheme in ["http", "https"] and self._requests:
-            response = self._requests.get(uri)
+            response = self.get_session().get(uri)
             yaml = YAML()
             result = yaml.safe_load(response.content)
         else:
@@ -100,7 +582,165 @@ class OpenApiRefResolver(jsonschema.RefResolver):
         return result
 
 
-def _resolve_refs(uri, spec):
+# Maximal number of remote documents fetched concurrently
+REMOTE_FETCH_WORKERS = 8
+
+# Timeout of fetching a remote document in seconds
+REMOTE_FETCH_TIMEOUT = 30
+
+
+def _get_remote_refs(base_uri, document):
+    """Get URLs of the remote (http/https) documents referred by document"""
+    urls = set()
+    seen = set()
+    stack = [document]
+    while stack:
+        node = stack.pop()
+        # Only containers may be shared (YAML aliases)
+        if not isinstance(node, (dict, list)) or id(node) in seen:
+            continue
+        seen.add(id(node))
+        if isinstance(node, dict):
+            ref = node.get("$ref")
+            # Fragments refer to the document itself
+            if isinstance(ref, str) and not ref.startswith("#"):
+                url, _ = urldefrag(urljoin(base_uri, ref))
+                if urlsplit(url).scheme in ("http", "https"):
+                    urls.add(url)
+            stack.extend(node.values())
+        else:
+            stack.extend(node)
+    return urls
+
+
+def _http_get(session, url, headers):
+    """GET the url with the pooled session or with urllib without it
+
+    :returns: tuple of the status, response headers and content
+    """
+    if session:
+        response = session.get(
+            url, headers=headers, timeout=REMOTE_FETCH_TIMEOUT
+        )
+        if response.status_code != 304:
+            response.raise_for_status()
+        return response.status_code, response.headers, response.content
+    try:
+        with closing(
+            urlopen(
+                Request(url, headers=headers), timeout=REMOTE_FETCH_TIMEOUT
+            )
+        ) as response:
+            return response.status, response.headers, response.read()
+    except HTTPError as ex:
+        if ex.code != 304:
+            raise
+        return ex.code, ex.headers, None
+
+
+def _fetch_remote(session, url, cachedir=None):
+    """Fetch content of the remote document
+
+    Fetched documents are kept in `cachedir` together with their ETag and
+    Last-Modified headers, so that they are only downloaded again when
+    changed. The cached document is used when the server is not reachable.
+    """
+    cache_file = cached = None
+    if cachedir:
+        cache_file = os.path.join(
+            cachedir, hashlib.sha256(url.encode("utf-8")).hexdigest()
+        )
+        try:
+            with open(cache_file, "rb") as stream:
+                cached = pickle.load(stream)
+        except FileNotFoundError:
+            pass
+        except Exception as ex:
+            LOG.warning("Ignoring broken remote cache %s: %s", cache_file, ex)
+
+    headers = {}
+    if cached and cached["etag"]:
+        headers["If-None-Match"] = cached["etag"]
+    if cached and cached["last-modified"]:
+        headers["If-Modified-Since"] = cached["last-modified"]
+    try:
+        status, response_headers, content = _http_get(session, url, headers)
+    except Exception as ex:
+        if not cached:
+            raise
+        LOG.warning("Using cached %s: %s", url, ex)
+        return cached["content"]
+    if status == 304 and cached:
+        return cached["content"]
+
+    if cache_file:
+        _write_atomic(
+            cache_file,
+            pickle.dumps(
+                {
+                    "etag": response_headers.get("ETag"),
+                    "last-modified": response_headers.get("Last-Modified"),
+                    "content": content,
+                },
+                protocol=pickle.HIGHEST_PROTOCOL,
+            ),
+        )
+    return content
+
+
+def _parse_remote(url, content):
+    """Parse the remote YAML or JSON document"""
+    _, extension = os.path.splitext(urlsplit(url).path)
+    if extension in (".yml", ".yaml"):
+        return _load_spec(content, "utf-8")
+    return json.loads(content)
+
+
+def _prefetch_remote_refs(resolver, uri, spec, cachedir=None):
+    """Fetch remote documents referred by the spec into the resolver store
+
+    All distinct remote documents, including the ones referred by other
+    remote documents, are fetched concurrently over the pooled session
+    instead of one by one while the references are being resolved.
+    Documents which fail to be fetched are left to `resolve_remote`.
+    """
+    pending = {
+        url for url in _get_remote_refs(uri, spec) if url not in resolver.store
+    }
+    if not pending:
+        return
+    session = OpenApiRefResolver.get_session()
+    seen = set()
+    futures: dict[concurrent.futures.Future, str] = {}
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=REMOTE_FETCH_WORKERS
+    ) as executor:
+        while pending or futures:
+            for url in pending - seen:
+                if url not in resolver.store:
+                    future = executor.submit(
+                        _fetch_remote, session, url, cachedir
+                    )
+                    futures[future] = url
+            seen |= pending
+            pending = set()
+            if not futures:
+                break
+            done, _ = concurrent.futures.wait(
+                futures, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for future in done:
+                url = futures.pop(future)
+                try:
+                    document = _parse_remote(url, future.result())
+                except Exception as ex:
+                    LOG.warning("Failed to prefetch %s: %s", url, ex)
+                    continue
+                resolver.store[url] = document
+                pending |= _get_remote_refs(url, document)
+
+
+def _resolve_refs(uri, spec, cachedir=None, referrer=None):
     """Resolve JSON references in a given dictionary.
 
     OpenAPI spec may contain JSON references to its nodes or external
@@ -110,40 +750,85 @@ def _resolve_refs(uri, spec):
 
         https://tools.ietf.org/html/draft-pbryan-zyp-json-ref-02
 
+    Every reference is resolved only once and the very same resolved
+    object is placed at every place referring to it, so the result is a
+    DAG rather than a tree. Recursive data types are cut with a distinct
+    ``{"type": "object"}`` node.
+
+    Remote documents are fetched upfront (see `_prefetch_remote_refs`),
+    and kept in `cachedir` when given.
+
+    Local references are resolved against `referrer` when given instead
+    of the spec itself. Only the objects reachable from the spec are
+    resolved then, and they are copied first, so that the referrer is
+    never modified.
+
     The input spec is modified in-place despite being returned from
     the function.
     """
 
-    resolver = OpenApiRefResolver(uri, spec)
-
-    def _do_resolve(node, seen=[]):
+    resolver = OpenApiRefResolver(uri, spec if referrer is None else referrer)
+    _prefetch_remote_refs(resolver, uri, spec, cachedir)
+    # Resolved objects by the absolute reference url
+    resolved_refs: dict[str, Any] = {}
+    # Ids of the referred objects which were already completely resolved
+    done: set[int] = set()
+    # Ids of the containers on the path being currently resolved
+    in_progress: set[int] = set()
+    # Reference urls on the path being currently resolved
+    in_progress_refs: set[str] = set()
+
+    def _do_resolve(node):
         if isinstance(node, collections.abc.Mapping) and "$ref" in node:
-            ref = node["$ref"]
-            with resolver.resolving(ref) as resolved:
-                if ref in seen:
-                    return {
-                        type: "object"
-                    }  # return a distinct object for recursive data type
-                return _do_resolve(
-                    resolved, seen + [ref]
-                )  # might have other references
-        elif isinstance(node, collections.abc.Mapping):
+            url, resolved = resolver.resolve(node["$ref"])
+            if url in resolved_refs:
+                return resolved_refs[url]
+            if id(resolved) in in_progress or url in in_progress_refs:
+                # return a distinct object for recursive data type
+                return {"type": "object"}
+            if referrer is not None:
+                resolved = copy.deepcopy(resolved)
+            # resolved object might have other (relative) references
+            resolver.push_scope(url)
+            in_progress_refs.add(url)
+            try:
+                result = _do_resolve(resolved)
+            finally:
+                in_progress_refs.discard(url)
+                resolver.pop_scope()
+            resolved_refs[url] = result
+            done.add(id(result))
+            return result
+
+        if id(node) in done or not isinstance(
+            node, (collections.abc.Mapping, list)
+        ):
+            return node
+        in_progress.add(id(node))
+        if isinstance(node, collections.abc.Mapping):
             for k, v in node.items():
-                node[k] = _do_resolve(v, seen)
-        elif isinstance(node, (list, tuple)):
+                node[k] = _do_resolve(v)
+        else:
             for i in range(len(node)):
-                node[i] = _do_resolve(node[i], seen)
+                node[i] = _do_resolve(node[i])
+        in_progress.discard(id(node))
         return node
 
     return _do_resolve(spec)
 
 
+@_profiled("normalize_spec")
 def normalize_spec(spec, **options):
     # OpenAPI spec may contain JSON references, so we need resolve them
     # before we access the actual values trying to build an httpdomain
     # markup. Since JSON references may be relative, it's crucial to
     # pass a document URI in order to properly resolve them.
-    spec = _resolve_refs(options.get("uri", ""), spec)
+    spec = _resolve_refs(
+        options.get("uri", ""),
+        spec,
+        options.get("remote_cachedir"),
+        options.get("referrer"),
+    )
 
     # OpenAPI spec may contain common endpoint's parameters top-level.
     # In order to do not place if-s around the code to handle special
@@ -156,6 +841,578 @@ def normalize_spec(spec, **options):
             method["parameters"].extend(parameters)
 
 
+class _FrozenDict(dict):
+    """Read-only dict of the normalized spec"""
+
+    __slots__ = ()
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("normalized spec is read-only")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __reduce__(self):
+        return (self.__class__, (dict(self),))
+
+
+class _FrozenList(list):
+    """Read-only list of the normalized spec"""
+
+    __slots__ = ()
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("normalized spec is read-only")
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _readonly
+    append = clear = extend = insert = pop = remove = _readonly
+    reverse = sort = _readonly
+
+    def __reduce__(self):
+        return (self.__class__, (list(self),))
+
+
+def _freeze(node, frozen=None):
+    """Convert the spec into read-only containers
+
+    Objects shared between multiple places (resolved references) stay
+    shared in the result.
+    """
+    if frozen is None:
+        frozen = {}
+    if not isinstance(node, (dict, list)):
+        return node
+    if id(node) in frozen:
+        return frozen[id(node)]
+    if isinstance(node, dict):
+        result = _FrozenDict((k, _freeze(v, frozen)) for k, v in node.items())
+    else:
+        result = _FrozenList(_freeze(v, frozen) for v in node)
+    frozen[id(node)] = result
+    return result
+
+
+def _forget_normalized_spec(spec):
+    """Drop the data derived from the evicted normalized spec"""
+    _OPERATIONS_BY_TAG_CACHE.pop(id(spec), None)
+    for key in [x for x in _PRUNED_CACHE if x[0] == id(spec)]:
+        del _PRUNED_CACHE[key]
+    # Entries of the single schemas are not tracked by the spec
+    _SCHEMA_JSON_CACHE.clear()
+    _FIELD_ROWS_CACHE.clear()
+    _VERSION_RANGES.clear()
+
+
+# Normalized specs by the spec content hash and uri. Normalization works on a
+# copy of the parsed spec, so that the spec cached by `_get_spec` is never
+# modified, and the result is frozen to be safely shared by all directives.
+_NORMALIZED_SPEC_CACHE = _MemoryBoundedCache(
+    SPEC_CACHE_MEMORY, on_evict=_forget_normalized_spec
+)
+
+
+def _get_normalized_spec(
+    abspath, encoding, uri, cachedir=None, operation_filter=None
+):
+    """Get the normalized read-only spec
+
+    :param abspath: Absolute path to the spec file.
+    :param encoding: Encoding of the spec file.
+    :param uri: URI of the spec used to resolve relative references.
+    :param cachedir: Directory to persist parsed specs in.
+    :param operation_filter: Selection of the operations (see
+        `_get_operation_filter`). The normalized spec holds only the
+        selected operations and only the references reachable from them
+        are resolved.
+    """
+    spec_key = _get_spec_key(abspath, encoding)
+    key, size, _ = spec_key
+    spec = _NORMALIZED_SPEC_CACHE.get((key, uri, operation_filter))
+    if spec is not None:
+        return spec
+
+    parsed = _get_spec(abspath, encoding, cachedir, spec_key)
+    referrer = None
+    if operation_filter is not None:
+        spec, selected, total = _select_operations(parsed, operation_filter)
+        # Size of the reached components is unknown upfront, estimate the
+        # memory by the share of the selected operations.
+        size = size * max(selected, 1) // max(total, 1)
+        referrer = parsed
+    else:
+        spec = parsed
+    spec = copy.deepcopy(spec)
+    normalize_spec(
+        spec,
+        uri=uri,
+        remote_cachedir=cachedir and os.path.join(cachedir, "remote"),
+        referrer=referrer,
+    )
+    spec = _freeze(spec)
+    _NORMALIZED_SPEC_CACHE.put(
+        (key, uri, operation_filter), spec, SPEC_MEMORY_FACTOR * size
+    )
+    return spec
+
+
+# Single line text without any characters having special meaning in
+# Markdown (nor starting with an ordered list marker like "1." or "2)"). It is
+# rendered as a simple paragraph without invoking the parser.
+_PLAIN_TEXT_RE = re.compile(
+    r"(?!\d+[.)](?:\s|$))[^\W_](?:[^\W_]|[ ,.;:'\"?/%=()-])*(?<! )"
+)
+
+# Maximal number of distinct Markdown fragments kept in the cache
+MARKDOWN_CACHE_SIZE = 4096
+
+# Parsed Markdown fragments (docutils nodes) by the Markdown content
+_MARKDOWN_CACHE: collections.OrderedDict[str, list] = collections.OrderedDict()
+
+
+# HTTP methods of the OpenAPI path item in the order they are rendered
+HTTP_METHODS = (
+    "head",
+    "get",
+    "post",
+    "put",
+    "patch",
+    "delete",
+    "options",
+    "trace",
+)
+
+# Operations of the normalized specs grouped by tag name
+_OPERATIONS_BY_TAG_CACHE: dict[int, tuple[Any, dict[str, list]]] = {}
+
+
+def _get_operations_by_tag(spec):
+    """Get operations of the normalized spec grouped by the tag name
+
+    The index is built only once per normalized spec. Operations without
+    tags are placed under the "default" tag.
+
+    :returns: dict of tag name to the list of (url, method, operation)
+    """
+    cached = _OPERATIONS_BY_TAG_CACHE.get(id(spec))
+    if cached and cached[0] is spec:
+        return cached[1]
+    index: dict[str, list] = {}
+    for url, path_def in spec.get("paths", {}).items():
+        for method in HTTP_METHODS:
+            if method not in path_def:
+                continue
+            operation_def = path_def[method]
+            for tag_name in operation_def.get("tags") or ["default"]:
+                index.setdefault(tag_name, []).append(
+                    (url, method, operation_def)
+                )
+    _OPERATIONS_BY_TAG_CACHE[id(spec)] = (spec, index)
+    return index
+
+
+def _get_operation_filter(options):
+    """Get the selection of the operations from the directive options
+
+    :returns: tuple of the selected tag names, path prefixes and
+        operationIds as frozensets (None for options not given), or None
+        when all operations are selected
+    """
+    operation_filter = []
+    for name in ("tags", "paths", "operations"):
+        if name in options:
+            values = (x.strip() for x in options[name].split(","))
+            operation_filter.append(frozenset(filter(None, values)))
+        else:
+            operation_filter.append(None)
+    if all(x is None for x in operation_filter):
+        return None
+    return tuple(operation_filter)
+
+
+def _is_operation_selected(operation_filter, url, operation_def):
+    """Whether the operation matches all options of the filter"""
+    tags, paths, operation_ids = operation_filter
+    if tags is not None and tags.isdisjoint(
+        operation_def.get("tags") or ["default"]
+    ):
+        return False
+    if paths is not None and not any(
+        url == prefix or url.startswith(prefix + "/")
+        for prefix in (x.rstrip("/") for x in paths)
+    ):
+        return False
+    return (
+        operation_ids is None
+        or operation_def.get("operationId") in operation_ids
+    )
+
+
+def _select_operations(spec, operation_filter):
+    """Get the spec holding only the selected operations
+
+    Components are left out, they are resolved on demand from the original
+    spec. Objects of the original spec are shared with the result.
+
+    :returns: tuple of the spec, count of the selected operations and the
+        count of all operations
+    """
+    paths = {}
+    selected = total = 0
+    for url, path_def in spec.get("paths", {}).items():
+        path_item = {}
+        for method in HTTP_METHODS:
+            if method not in path_def:
+                continue
+            total += 1
+            if _is_operation_selected(operation_filter, url, path_def[method]):
+                path_item[method] = path_def[method]
+        if path_item:
+            selected += len(path_item)
+            if "parameters" in path_def:
+                path_item["parameters"] = path_def["parameters"]
+            paths[url] = path_item
+    result = {k: v for k, v in spec.items() if k != "components"}
+    result["paths"] = paths
+    return result, selected, total
+
+
+def _get_json_body(spec):
+    """Get the JSON body schema of the request body or response"""
+    return spec.get("content", {}).get("application/json", {}).get("schema")
+
+
+def _get_action_bodies(operation_spec):
+    """Index bodies of the actions of the `/action` operation by action name
+
+    Bodies of the actions are the `oneOf` options of the request body and
+    of the response bodies, which name the action they belong to with
+    `x-openstack.action-name`. Requests of the actions without the name
+    are named by their only property.
+
+    Responses with no body, or with bodies not naming any action, are not
+    indexed. When bodies of the response belong to other actions only, the
+    response body of the action is `None`, i.e. the action returns no body
+    (or not this response at all), which is not described by the spec.
+
+    :returns: dict of the action name to the tuple of the request body and
+        the dict of the response code to the response body of the action.
+        Empty dict when the operation is not an action.
+    """
+    body = _get_json_body(operation_spec.get("requestBody", {})) or {}
+    if body.get("x-openstack", {}).get("discriminator") != "action":
+        return {}
+    actions = {}
+    for candidate in body.get("oneOf", []):
+        action_name = candidate.get("x-openstack", {}).get("action-name")
+        if not action_name:
+            # No action name on the body. Take 1st property name
+            action_name = next(iter(candidate["properties"]))
+        actions[action_name] = (candidate, {})
+
+    for code, response_spec in operation_spec.get("responses", {}).items():
+        response_body = _get_json_body(response_spec)
+        if not response_body:
+            continue
+        candidates = [
+            (x.get("x-openstack", {}).get("action-name"), x)
+            for x in response_body.get("oneOf") or [response_body]
+        ]
+        if not any(action_name for action_name, _ in candidates):
+            continue
+        for _, responses in actions.values():
+            responses[code] = None
+        # Several bodies of the same action (i.e. of different
+        # microversions) may be present, the last one is rendered
+        for action_name, candidate in candidates:
+            if action_name in actions:
+                actions[action_name][1][code] = candidate
+    return actions
+
+
+def _parse_version(version):
+    """Parse the microversion into a comparable tuple (2.79 -> (2, 79))"""
+    return tuple(int(x) for x in str(version).strip().split("."))
+
+
+# Parsed (min-ver, max-ver) by the `x-openstack` extension of the spec node.
+# The extensions are shared by the normalized and the pruned specs.
+_VERSION_RANGES: dict[int, tuple[Any, tuple]] = {}
+
+
+def _get_version_range(node):
+    """Get the parsed microversion range of the spec node
+
+    :returns: tuple of min-ver and max-ver, each None when not limited
+    """
+    os_ext = node.get("x-openstack")
+    if not isinstance(os_ext, collections.abc.Mapping):
+        return None, None
+    cached = _VERSION_RANGES.get(id(os_ext))
+    if cached and cached[0] is os_ext:
+        return cached[1]
+    result = tuple(
+        _parse_version(os_ext[key]) if os_ext.get(key) else None
+        for key in ("min-ver", "max-ver")
+    )
+    _VERSION_RANGES[id(os_ext)] = (os_ext, result)
+    return result
+
+
+def _microversion_option(argument):
+    """Validate the microversion option of the directive"""
+    argument = directives.unchanged_required(argument)
+    _parse_version(argument)
+    return argument.strip()
+
+
+# Marker of the spec nodes not available in the microversion
+_UNAVAILABLE = object()
+
+# Pruned spec nodes by the normalized spec and the microversion
+_PRUNED_CACHE: dict[tuple[int, tuple], tuple[Any, dict]] = {}
+
+
+def _prune_to_version(spec, node, version):
+    """Prune the node of the normalized spec to the microversion
+
+    Everything limited with `x-openstack` min-ver/max-ver to other
+    microversions (operations, parameters, properties, oneOf branches) is
+    dropped, and oneOf with the microversion discriminator is replaced by
+    the single matching branch. Nodes without changes are returned as is
+    and every node is pruned only once per spec and microversion, so the
+    result shares objects the same way as the spec does.
+
+    :returns: pruned node or `_UNAVAILABLE` when the node itself is not
+        available in the microversion
+    """
+    cached = _PRUNED_CACHE.get((id(spec), version))
+    if not cached or cached[0] is not spec:
+        cached = _PRUNED_CACHE[(id(spec), version)] = (spec, {})
+    pruned = cached[1]
+
+    def _do_prune(node):
+        if not isinstance(node, (dict, list)):
+            return node
+        if id(node) in pruned:
+            return pruned[id(node)][1]
+        if isinstance(node, dict):
+            result = _prune_dict(node)
+        else:
+            items = [_do_prune(x) for x in node]
+            result = _FrozenList(x for x in items if x is not _UNAVAILABLE)
+            if len(result) == len(node) and all(
+                x is y for x, y in zip(result, node)
+            ):
+                result = node
+        pruned[id(node)] = (node, result)
+        return result
+
+    def _prune_dict(node):
+        min_ver, max_ver = _get_version_range(node)
+        if (min_ver and version < min_ver) or (max_ver and version > max_ver):
+            return _UNAVAILABLE
+        items = {}
+        for key, value in node.items():
+            value = _do_prune(value)
+            if value is not _UNAVAILABLE:
+                items[key] = value
+        if (
+            node.get("x-openstack", {}).get("discriminator") == "microversion"
+            and "oneOf" in items
+        ):
+            if not items["oneOf"]:
+                return _UNAVAILABLE
+            if len(items["oneOf"]) == 1:
+                return items["oneOf"][0]
+        if "required" in items and "properties" in items:
+            items["required"] = _FrozenList(
+                x for x in items["required"] if x in items["properties"]
+            )
+            if items["required"] == node["required"]:
+                items["required"] = node["required"]
+        if len(items) == len(node) and all(
+            items[key] is value for key, value in node.items()
+        ):
+            return node
+        return _FrozenDict(items)
+
+    return _do_prune(node)
+
+
+# Compact JSON of the schemas of the normalized specs. Resolved references
+# are shared objects, so every distinct schema is only dumped once.
+_SCHEMA_JSON_CACHE: dict[int, tuple[Any, str, str]] = {}
+
+
+def _get_schema_json(schema):
+    """Get the compact JSON of the schema
+
+    :returns: tuple of the content hash and the compact JSON
+    """
+    cached = _SCHEMA_JSON_CACHE.get(id(schema))
+    if cached and cached[0] is schema:
+        return cached[1], cached[2]
+    compact = json.dumps(schema, separators=(",", ":"))
+    digest = hashlib.sha256(compact.encode("utf-8")).hexdigest()[:16]
+    _SCHEMA_JSON_CACHE[id(schema)] = (schema, digest, compact)
+    return digest, compact
+
+
+# Rows of the body fields table by the id of the schema. The schema is kept
+# in the value to ensure the id is not reused by another object.
+_FIELD_ROWS_CACHE: dict[int, tuple[Any, list]] = {}
+
+
+def _get_field_rows(schema):
+    """Get rows of the fields table of the body schema
+
+    Properties of objects are flattened into dotted names and fields of the
+    array items are named after the array (`servers[].id`). Options of the
+    microversion and action `oneOf` share the names, the first option
+    describing the field wins. The schema is walked iteratively and the rows
+    are cached, since the same schemas are used by many operations.
+
+    :returns: list of (name, location, type, description) tuples
+    """
+    if not schema:
+        return []
+    cached = _FIELD_ROWS_CACHE.get(id(schema))
+    if cached and cached[0] is schema:
+        return cached[1]
+
+    rows = []
+    emitted_fields = set()
+    # (field, field name, whether the field gets own row)
+    stack = [(schema, None, True)]
+    while stack:
+        field, field_name, own_row = stack.pop()
+        if not field:
+            continue
+        typ = field.get("type")
+        if typ and own_row and field_name and field_name not in emitted_fields:
+            emitted_fields.add(field_name)
+            note = None
+            os_ext = field.get("x-openstack", {})
+            if os_ext.get("min-ver"):
+                note = (
+                    "<br/><strong>New in version "
+                    f"{os_ext['min-ver']}</strong>"
+                )
+            if os_ext.get("max-ver"):
+                note = (
+                    "<br/><strong>Available until version "
+                    f"{os_ext['max-ver']}</strong>"
+                )
+            descr = f'{field.get("description", "")}{note or ""}'
+            rows.append((field_name, "body", typ, descr))
+
+        children = []
+        if typ == "object" and "properties" in field:
+            children = [
+                (v, f"{field_name}.{k}" if field_name else k, True)
+                for k, v in field["properties"].items()
+            ]
+        elif typ == "array" and isinstance(field.get("items"), dict):
+            # Row of the array describes the items already
+            children = [(field["items"], f"{field_name or ''}[]", False)]
+        elif not typ and "oneOf" in field:
+            discriminator = field.get("x-openstack", {}).get("discriminator")
+            if discriminator in ("microversion", "action"):
+                children = [
+                    (opt, field_name, own_row) for opt in field["oneOf"]
+                ]
+        stack.extend(reversed(children))
+
+    _FIELD_ROWS_CACHE[id(schema)] = (schema, rows)
+    return rows
+
+
+def _get_schema_preview(schema, size):
+    """Pretty-print the beginning of the schema
+
+    The schema is encoded incrementally and encoding stops once `size`
+    characters are produced, so huge schemas are never dumped entirely.
+    """
+    chunks = []
+    length = 0
+    for chunk in json.JSONEncoder(indent=2).iterencode(schema):
+        chunks.append(chunk)
+        length += len(chunk)
+        if length >= size:
+            break
+    return "".join(chunks)[:size]
+
+
+# Node stores saved by `store_operations` in this process, which are used
+# by `ExpandOperations` instead of loading them again (like the doctrees
+# cached by Sphinx between reading and writing the document)
+_OPERATION_STORES: dict[str, dict] = {}
+
+
+def _load_node_cache(path):
+    """Load nodes of the operations built by the previous build
+
+    :returns: dict of the operation fingerprint to the tuple of the nodes
+        and the digests of the Markdown fragments of the operation
+    """
+    try:
+        with open(path, "rb") as stream:
+            return pickle.load(stream)
+    except FileNotFoundError:
+        pass
+    except Exception as ex:
+        LOG.warning("Ignoring broken node cache %s: %s", path, ex)
+    return {}
+
+
+def _save_node_cache(path, operation_nodes):
+    """Save nodes of the operations for the next build"""
+    _write_atomic(
+        path, pickle.dumps(operation_nodes, protocol=pickle.HIGHEST_PROTOCOL)
+    )
+
+
+# Directive, spec and operations index shared with the forked workers
+# building tag sections in parallel
+_PARALLEL_CONTEXT: tuple | None = None
+
+
+def _get_doc_stats(env):
+    """Get statistics of the document being read"""
+    return env.os_openapi_stats.setdefault(env.docname, collections.Counter())
+
+
+def _get_doc_markdown(env):
+    """Get digests of the Markdown fragments used by the document being read"""
+    return env.os_openapi_markdown_used.setdefault(env.docname, set())
+
+
+def _build_api_group_nodes(tag):
+    """Build the tag section in the forked worker
+
+    :returns: tuple of the section, statistics of the worker, nodes of
+        the operations built by the worker, digests of the Markdown
+        fragments used by the worker and profile of the worker
+    """
+    global _PROFILE
+    directive, spec, operations_by_tag = _PARALLEL_CONTEXT
+    stats = _get_doc_stats(directive.env)
+    before = stats.copy()
+    markdown = _get_doc_markdown(directive.env)
+    markdown_before = markdown.copy()
+    directive._operation_nodes = {}
+    if _PROFILE is not None:
+        _PROFILE = {"phases": {}, "operations": []}
+    section = directive._get_api_group_nodes(spec, tag, operations_by_tag)
+    return (
+        section,
+        stats - before,
+        directive._operation_nodes,
+        markdown - markdown_before,
+        _PROFILE,
+    )
+
+
 class OpenApiDirective(SphinxDirective):
     """Directive implementation"""
 
@@ -164,9 +1421,16 @@ class OpenApiDirective(SphinxDirective):
         {
             "source_encoding": directives.encoding,
             "service_type": directives.unchanged,
+            "split": lambda x: directives.choice(x, ("tag",)),
+            "tags": directives.unchanged,
+            "paths": directives.unchanged,
+            "operations": directives.unchanged,
+            "microversion": _microversion_option,
         },
     )
     parser: Parser
+    # Digests of the Markdown fragments of the operation being built
+    _markdown: set[str] | None = None
 
     def run(self):
         relpath, abspath = self.env.relfn2path(
@@ -177,23 +1441,35 @@ class OpenApiDirective(SphinxDirective):
         # URI parameter is crucial for resolving relative references. So we
         # need to set this option properly as it's used later down the
         # stack.
-        self.options.setdefault("uri", "file://%s" % abspath)
+        # Symlinked specs are resolved to the real file so that they share a
+        # single normalized spec.
+        self.options.setdefault("uri", "file://%s" % os.path.realpath(abspath))
 
         # Add a given OpenAPI spec as a dependency of the referring
         # reStructuredText document, so the document is rebuilt each time
         # the spec is changed.
         self.env.note_dependency(relpath)
 
+        global _PROFILE_SPEC
+        _PROFILE_SPEC = self._spec_name = relpath
+
         # Read the spec using encoding passed to the directive or fallback to
         # the one specified in Sphinx's config.
         encoding = self.options.get("encoding", self.config.source_encoding)
 
-        spec: dict[str, Any] = _get_spec(abspath, encoding)
+        # Only the selected operations (and the references they reach) are
+        # resolved and rendered when the spec is filtered.
+        operation_filter = _get_operation_filter(self.options)
+        spec: dict[str, Any] = _get_normalized_spec(
+            abspath,
+            encoding,
+            self.options["uri"],
+            os.path.join(self.env.doctreedir, "os_openapi"),
+            operation_filter,
+        )
         # spec filename as copied to
         fname: str | None = None
 
-        normalize_spec(spec)
-
         # if "service_type" in self.options:
         #     st = self.options.get("service_type")
         #     # copy spec under the _static
@@ -210,20 +1486,194 @@ class OpenApiDirective(SphinxDirective):
 
         results = []
 
-        for hdr in self._get_spec_header_nodes(spec, fname):
-            results.append(hdr)
-
-        for tag in spec.get("tags", ["default"]):
-            results.append(self._get_api_group_nodes(spec, tag))
+        operations_by_tag = _get_operations_by_tag(spec)
+        tags = spec.get("tags", [{"name": "default"}])
+        if "tags" in self.options:
+            # Only selected groups are rendered
+            tags = [tag for tag in tags if tag["name"] in operation_filter[0]]
+        if "paths" in self.options or "operations" in self.options:
+            # Groups without any selected operation are left out
+            tags = [tag for tag in tags if tag["name"] in operations_by_tag]
+        if operation_filter is not None and not any(
+            operations_by_tag.get(tag["name"]) for tag in tags
+        ):
+            LOG.warning(
+                "No operations of %s are selected by the options %s",
+                relpath,
+                ", ".join(
+                    f":{name}: {self.options[name]}"
+                    for name in ("tags", "paths", "operations")
+                    if name in self.options
+                ),
+                location=self.get_location(),
+            )
+        # Pages of the groups of the split spec are linked from the page
+        # with the spec header
+        if self.env.docname not in self.env.os_openapi_split_pages:
+            for hdr in self._get_spec_header_nodes(spec, fname):
+                results.append(hdr)
+
+        if self.options.get("split") == "tag":
+            # Groups are rendered on own pages generated by
+            # `generate_split_pages`, only link them here.
+            results.extend(self._get_split_toctree_nodes(spec, tags))
+            return results
+
+        # Nodes of the operations are cached between builds by the
+        # fingerprint of the operation, so that only changed operations are
+        # built again when the spec changes. The same file is the store the
+        # nodes are moved to from the doctree (see `store_operations`).
+        node_cache_file = self._get_node_cache_path()
+        self._node_store = os.path.relpath(
+            node_cache_file, self.env.doctreedir
+        )
+        self._cached_operation_nodes = _load_node_cache(node_cache_file)
+        self._operation_nodes = {}
+        self._response_body_nodes = {}
+
+        workers = self.config.openapi_parallel_workers
+        if workers > 1 and len(tags) > 1 and parallel_available:
+            results.extend(
+                self._get_api_group_nodes_parallel(
+                    spec, tags, operations_by_tag, workers
+                )
+            )
+        else:
+            for tag in tags:
+                results.append(
+                    self._get_api_group_nodes(spec, tag, operations_by_tag)
+                )
 
         return results
 
+    def _get_split_toctree_nodes(self, spec, tags):
+        """Build toctree linking pages of the groups of the split spec"""
+        docnames = _get_split_docnames(
+            self.env.docname, spec.get("tags", [{"name": "default"}])
+        )
+        content = StringList()
+        content.append(".. toctree::", "<openapi>")
+        content.append("   :maxdepth: 1", "<openapi>")
+        content.append("", "<openapi>")
+        for tag in tags:
+            content.append("   /" + docnames[tag["name"]], "<openapi>")
+        node = nodes.Element()
+        self.state.nested_parse(content, self.content_offset, node)
+        return node.children
+
+    def _get_api_group_nodes_parallel(
+        self, spec, tags, operations_by_tag, workers
+    ):
+        """Build tag sections in forked worker processes
+
+        Sections are returned in the order of `tags`.
+        """
+        global _PARALLEL_CONTEXT
+        _PARALLEL_CONTEXT = (self, spec, operations_by_tag)
+        try:
+            with concurrent.futures.ProcessPoolExecutor(
+                max_workers=min(workers, len(tags)),
+                mp_context=multiprocessing.get_context("fork"),
+            ) as executor:
+                for (
+                    section,
+                    stats,
+                    operation_nodes,
+                    markdown,
+                    profile,
+                ) in executor.map(_build_api_group_nodes, tags):
+                    _get_doc_stats(self.env).update(stats)
+                    _get_doc_markdown(self.env).update(markdown)
+                    self._operation_nodes.update(operation_nodes)
+                    if profile:
+                        _merge_profile(_PROFILE, profile)
+                    yield section
+        finally:
+            _PARALLEL_CONTEXT = None
+
+    @_profiled("_append_markdown_content")
     def _append_markdown_content(self, node, content: str):
-        """Parse Markdown `content` and append it to docutils `node`"""
+        """Parse Markdown `content` and append it to docutils `node`
+
+        Plain text is placed into the paragraph directly. Parsed nodes of
+        other content are cached and a copy of them is appended, since the
+        same descriptions are repeated over and over in the specs.
+        """
+        stats = _get_doc_stats(self.env)
+        if not content:
+            return
+        if _PLAIN_TEXT_RE.fullmatch(content):
+            stats["markdown_plain"] += 1
+            node += nodes.paragraph(content, content)
+            return
+
+        # Fragments parsed by the parallel readers are shared on disk and
+        # passed back to the main process (see `merge_caches`)
+        parsed = getattr(self.env, "os_openapi_markdown", None)
+        if parsed is not None:
+            digest = hashlib.sha256(
+                f"{__version__}:{myst_parser.__version__}:{content}".encode()
+            ).hexdigest()
+            _get_doc_markdown(self.env).add(digest)
+            if self._markdown is not None:
+                self._markdown.add(digest)
+        children = _MARKDOWN_CACHE.get(content)
+        if children is None:
+            if parsed is None:
+                children = self._parse_markdown(content)
+            else:
+                children = self._get_markdown_nodes(content, digest)
+                parsed[content] = children
+            _MARKDOWN_CACHE[content] = children
+            if len(_MARKDOWN_CACHE) > MARKDOWN_CACHE_SIZE:
+                _MARKDOWN_CACHE.popitem(last=False)
+        else:
+            stats["markdown_cached"] += 1
+            _MARKDOWN_CACHE.move_to_end(content)
+        for child in children:
+            node += child.deepcopy()
+
+    def _parse_markdown(self, content: str):
+        """Parse Markdown `content` into docutils nodes"""
+        _get_doc_stats(self.env)["markdown_parsed"] += 1
         document = make_document(parser_cls=self.parser)
         self.parser.parse(content, document)
-        for child in document:
-            node += child
+        return document.children
+
+    def _get_markdown_nodes(self, content: str, digest: str):
+        """Parse Markdown `content` unless parsed by another reader
+
+        While the documents are read in parallel, parsed fragments are
+        stored by their `digest` under `os_openapi/markdown` of the doctree
+        directory, so that they are shared by the concurrent readers and
+        reused by the next parallel builds. Fragments not used when the
+        documents were last read, including the ones of the operations
+        reused from the node stores, are removed (see
+        `remove_stale_files`).
+        """
+        stats = _get_doc_stats(self.env)
+        path = os.path.join(
+            self.env.doctreedir, "os_openapi", "markdown", digest + ".pickle"
+        )
+        try:
+            with open(path, "rb") as stream:
+                children = pickle.load(stream)
+        except FileNotFoundError:
+            pass
+        except Exception as ex:
+            LOG.warning("Ignoring broken Markdown cache %s: %s", path, ex)
+        else:
+            stats["markdown_cached"] += 1
+            return children
+
+        # Detached from the document to be pickled on their own
+        children = [
+            child.deepcopy() for child in self._parse_markdown(content)
+        ]
+        _write_atomic(
+            path, pickle.dumps(children, protocol=pickle.HIGHEST_PROTOCOL)
+        )
+        return children
 
     def _get_spec_header_nodes(
         self, spec: dict[str, Any], fname: str | None = None
@@ -253,7 +1703,8 @@ class OpenApiDirective(SphinxDirective):
             self._append_markdown_content(node, description)
             yield node
 
-    def _get_api_group_nodes(self, spec, tag):
+    @_profiled("_get_api_group_nodes")
+    def _get_api_group_nodes(self, spec, tag, operations_by_tag):
         """Process OpenAPI tags (group)"""
         tag_name = tag["name"]
         targetid = f"group-{tag_name}"
@@ -265,63 +1716,100 @@ class OpenApiDirective(SphinxDirective):
         if group_descr:
             self._append_markdown_content(section, group_descr)
 
-        for url, path_def in spec["paths"].items():
-            for method in ["head", "get", "post", "put", "delete"]:
-                if method in path_def and tag_name in path_def[method].get(
-                    "tags"
-                ):
-                    operation_def = path_def[method]
-                    for child in self._get_operation_nodes(
-                        spec, url, method, operation_def
-                    ):
-                        section += child
+        stats = _get_doc_stats(self.env)
+        version = self.options.get("microversion")
+        for url, method, operation_def in operations_by_tag.get(tag_name, []):
+            if version:
+                operation_def = _prune_to_version(
+                    spec, operation_def, _parse_version(version)
+                )
+                if operation_def is _UNAVAILABLE:
+                    continue
+            fingerprint = self._get_operation_fingerprint(
+                url, method, operation_def
+            )
+            entry = self._operation_nodes.get(
+                fingerprint, self._cached_operation_nodes.get(fingerprint)
+            )
+            if entry is None:
+                stats["operations_regenerated"] += 1
+                self._markdown = set()
+                try:
+                    children = list(
+                        self._get_operation_nodes(
+                            spec, url, method, operation_def
+                        )
+                    )
+                    entry = (children, frozenset(self._markdown))
+                finally:
+                    self._markdown = None
+            else:
+                stats["operations_reused"] += 1
+                # Stored Markdown fragments of the operation are still used
+                _get_doc_markdown(self.env).update(entry[1])
+            self._operation_nodes[fingerprint] = entry
+            children, markdown = entry
+            operation = openapi_operation(
+                key=fingerprint, store=self._node_store, markdown=markdown
+            )
+            for child in children:
+                operation += child.deepcopy()
+            section += operation
 
         return section
 
+    def _get_node_cache_path(self):
+        """Path of the operation nodes cache of this directive
+
+        The path depends on the document, the spec URI and the options of
+        the directive but not on its position in the document, so that
+        edits around the directive keep the cache. Directives with the
+        same options in a document share the cache.
+        """
+        key = json.dumps(
+            [self.env.docname, sorted(self.options.items())], default=str
+        )
+        return os.path.join(
+            self.env.doctreedir,
+            "os_openapi",
+            "nodes",
+            hashlib.sha256(key.encode("utf-8")).hexdigest() + ".pickle",
+        )
+
+    def _get_operation_fingerprint(self, path, method, operation_spec):
+        """Fingerprint of everything the operation nodes are built from"""
+        config = self.config
+        digest = hashlib.sha256(
+            f"{__version__}:{path}:{method}:"
+            f"{config.openapi_schema_inline_size}:"
+            f"{config.openapi_schema_preview_size}:"
+            f"{config.openapi_lazy_details}:".encode()
+        )
+        digest.update(
+            json.dumps(operation_spec, sort_keys=True, default=str).encode()
+        )
+        return digest.hexdigest()
+
+    @_profiled(
+        "_get_operation_nodes",
+        operation=lambda self, spec, path, method, op: op.get("operationId"),
+    )
     def _get_operation_nodes(self, spec, path, method, operation_spec):
         """Process OpenAPI operation"""
         # We might want to have multiple separate entries for single url
         # (a.k.a. actions)
         operation_specs = []
+        actions = {}
         if not path.endswith("/action"):
-            body = (
-                operation_spec.get("requestBody", {})
-                .get("content", {})
-                .get("application/json", {})
-                .get("schema")
-            )
+            body = _get_json_body(operation_spec.get("requestBody", {}))
             operation_specs.append((operation_spec, None, body))
         else:
-            # Body
-            body = (
-                operation_spec.get("requestBody", {})
-                .get("content", {})
-                .get("application/json", {})
-                .get("schema")
-            )
-            if body:
-                actions = body.get("oneOf", [])
-                discriminator = body.get("x-openstack", {}).get(
-                    "discriminator"
+            actions = _get_action_bodies(operation_spec)
+            for action_name, (request_body, _) in actions.items():
+                operation_specs.append(
+                    (operation_spec, action_name, request_body)
                 )
-                if actions and discriminator == "action":
-                    for candidate in actions:
-                        action_name = candidate.get("x-openstack", {}).get(
-                            "action-name"
-                        )
-                        if not action_name:
-                            # No action name on the body. Take 1st property
-                            # name
-                            action_name = list(candidate["properties"].keys())[
-                                0
-                            ]
-                        operation_specs.append(
-                            (operation_spec, action_name, candidate)
-                        )
-                else:
-                    # This does not look like an action, just return operation
-                    operation_specs.append((operation_spec, None, None))
-            else:
+            if not actions:
                 # This does not look like an action (no body), just return
                 # operation
                 operation_specs.append((operation_spec, None, None))
@@ -364,11 +1852,16 @@ class OpenApiDirective(SphinxDirective):
             op_header["operationId"] = op_id
             op_header["method"] = method
             op_header["path"] = path
+            op_header["spec"] = self._spec_name
             container += op_header
-            content = nodes.compound(
-                classes=["accordion-collapse collapse accordion-body"],
-                ids=[f"collapse{op_id}"],
-            )
+            if self.config.openapi_lazy_details:
+                # Details are written to a separate file and loaded only
+                # once the accordion is expanded
+                content = openapi_operation_details()
+            else:
+                content = nodes.compound()
+            content["classes"] = ["accordion-collapse collapse accordion-body"]
+            content["ids"] = [f"collapse{op_id}"]
             descr = operation_spec.get("description")
             if descr:
                 self._append_markdown_content(content, descr)
@@ -383,7 +1876,9 @@ class OpenApiDirective(SphinxDirective):
                 op_id, operation_spec, action_name, request_body
             )
             content += self._get_operation_response_node(
-                op_id, operation_spec, action_name
+                op_id,
+                operation_spec,
+                actions[action_name][1] if action_name else None,
             )
 
             container += content
@@ -414,19 +1909,6 @@ class OpenApiDirective(SphinxDirective):
         ul.extend([li_table, li_schema])
         request += ul
 
-        table = nodes.table()
-        tgroup = nodes.tgroup(cols=4)
-        for _ in range(4):
-            colspec = nodes.colspec(colwidth=1)
-            tgroup += colspec
-        table += tgroup
-        # Build table headers
-        thead = nodes.thead()
-        tgroup += thead
-        tr = nodes.row()
-        thead += tr
-        for col in ["Name", "Location", "Type", "Description"]:
-            tr += nodes.entry("", nodes.paragraph(text=col))
         # Table data
         rows = []
         # Parameters
@@ -434,238 +1916,644 @@ class OpenApiDirective(SphinxDirective):
             rows.append(self._get_request_table_param_row(param))
         # Body
         if not request_body:
-            body = (
-                operation_spec.get("requestBody", {})
-                .get("content", {})
-                .get("application/json", {})
-                .get("schema")
-            )
+            body = _get_json_body(operation_spec.get("requestBody", {}))
         else:
             body = request_body
 
-        for el in self._get_request_table_field_row(body, None, set()):
-            rows.append(el)
-
-        tbody = nodes.tbody()
-        tbody.extend(rows)
-        tgroup += tbody
+        rows.extend(_get_field_rows(body))
 
         if body:
             for key, sample in body.get("examples", {}).items():
-                for el in self._get_body_examples(key, sample):
-                    request += el
+                request += self._get_body_examples(key, sample)
 
         if rows:
-            li_table += table
+            li_table += self._get_fields_table(rows)
 
         # jsonschema
-        jsonschema_pre = nodes.literal_block(
-            "", classes=["json", "highlight-javascript"]
-        )
-        jsonschema_pre.append(
-            nodes.literal(
-                text=json.dumps(request_body, indent=2),
+        li_schema += self._get_schema_node(request_body)
+
+        return request
+
+    def _get_schema_node(self, schema):
+        """Build the JSON schema block
+
+        Small schemas are pretty-printed inline. Larger ones are written
+        once per distinct schema to a static JSON file, and only the
+        beginning of the schema is rendered together with the link
+        loading the whole schema on demand.
+        """
+        digest, compact = _get_schema_json(schema)
+        if len(compact) <= self.config.openapi_schema_inline_size:
+            return openapi_code(
+                code=json.dumps(schema, indent=2),
                 language="json",
-                classes=["highlight", "code"],
+                classes=["json"],
             )
+        node = openapi_schema()
+        node["digest"] = digest
+        node["schema"] = compact
+        node["preview"] = _get_schema_preview(
+            schema, self.config.openapi_schema_preview_size
         )
-        li_schema += jsonschema_pre
-
-        return request
+        return node
 
     def _get_operation_response_node(
-        self, operationId, operation_spec, action_name=None
+        self, operationId, operation_spec, action_responses=None
     ):
-        """Build the Response section"""
+        """Build the Response section
+
+        :param action_responses: response bodies of the action by the
+            response code (see `_get_action_bodies`) when the operation is
+            an action
+        """
         responses = nodes.section(ids=[f"api-res-{operationId}"])
         responses += nodes.title(text="Responses")
 
         response_specs = operation_spec.get("responses")
         for code, response_spec in sorted(response_specs.items()):
-            rsp_id = "response-%d" % self.env.new_serialno("response")
-            response = nodes.section(ids=[rsp_id])
+            # Id is assigned once the document is written (see
+            # `ExpandOperations`)
+            response = nodes.section(openapi_serial="response")
             response += nodes.title(text=code)
             descr = response_spec.get("description")
             if descr:
                 self._append_markdown_content(response, descr)
             responses += response
-            response_schema = None
-
-            table = nodes.table()
-            tgroup = nodes.tgroup(cols=4)
-            for _ in range(4):
-                colspec = nodes.colspec(colwidth=1)
-                tgroup += colspec
-            table += tgroup
-            # Build table headers
-            thead = nodes.thead()
-            tgroup += thead
-            tr = nodes.row()
-            thead += tr
-            for col in ["Name", "Location", "Type", "Description"]:
-                tr += nodes.entry("", nodes.paragraph(text=col))
-            # Table data
-            rows = []
+
             # TODO(gtema) Operation may return headers
             # for param in operation_spec.get("parameters", []):
             #     rows.append(self._get_request_table_param_row(param))
             # Body
-            if not action_name:
-                response_schema = (
-                    response_spec.get("content", {})
-                    .get("application/json", {})
-                    .get("schema")
-                )
+            if action_responses is None:
+                response_schema = _get_json_body(response_spec)
+            elif code in action_responses:
+                response_schema = action_responses[code]
+                if response_schema is None:
+                    # Bodies of the response belong to other actions. The
+                    # code the action returns when it has no body at all
+                    # is not present in openapi.
+                    response += nodes.paragraph(
+                        text="No body of this response is described for "
+                        "the action."
+                    )
             else:
-                # Iterate over all available responses to find suitable action
-                # response
-                candidates = []
-                body_candidate = (
-                    response_spec.get("content", {})
-                    .get("application/json", {})
-                    .get("schema")
-                )
-                if body_candidate:
-                    candidates = body_candidate.get("oneOf", [])
-                    if not candidates:
-                        candidates.append(body_candidate)
-
-                for candidate in candidates:
-                    os_ext = candidate.get("x-openstack", {})
-                    rsp_act_name = os_ext.get("action-name")
-                    if rsp_act_name == action_name:
-                        response_schema = candidate
-
-                # TODO(gtema) how to properly identify response code of the
-                # action when it returns no body at all. This info is present
-                # on the server side, but is missing in openapi
+                # Response without a body of any action
+                response_schema = None
 
             if response_schema:
-                for el in self._get_request_table_field_row(
-                    response_schema, None, set()
-                ):
-                    rows.append(el)
+                body = self._get_response_body_node(response_schema)
+                if body:
+                    response += body
 
-            tbody = nodes.tbody()
-            tbody.extend(rows)
-            tgroup += tbody
+        return responses
 
-            if rows:
-                response += table
+    def _get_response_body_node(self, schema):
+        """Build the fields table and examples of the response body
+
+        Most operations share the same few response bodies, so the node is
+        built once per distinct schema and shared by the operations. Nodes
+        of the operations are only deep copied into the document (see
+        `_get_api_group_nodes`), so the sharing does not leak into it.
+        """
+        digest, _ = _get_schema_json(schema)
+        if digest in self._response_body_nodes:
+            return self._response_body_nodes[digest]
+        node = openapi_response_body(digest=digest)
+        rows = _get_field_rows(schema)
+        if rows:
+            node += self._get_fields_table(rows)
+        for key, sample in schema.get("examples", {}).items():
+            node += self._get_body_examples(key, sample)
+        if not node.children:
+            node = None
+        self._response_body_nodes[digest] = node
+        return node
 
-            if response_schema:
-                for key, sample in response_schema.get("examples", {}).items():
-                    for el in self._get_body_examples(key, sample):
-                        response += el
+    def _get_fields_table(self, rows):
+        """Build the table of the parameters and body fields
 
-        return responses
+        :param rows: list of (name, location, type, description) tuples
+        """
+        table = openapi_fields_table(rows=[])
+        for name, location, typ, descr in rows:
+            table["rows"].append((name, location, str(typ)))
+            td = openapi_field_description()
+            self._append_markdown_content(td, descr)
+            table += td
+        return table
 
     def _get_request_table_param_row(self, param):
         """Build a row of a request parameters table with the
         parameter/header"""
-        tr = nodes.row()
-        tr += nodes.entry("", nodes.paragraph(text=param["name"]))
-        tr += nodes.entry("", nodes.paragraph(text=param["in"]))
-        tr += nodes.entry("", nodes.paragraph(text=param["schema"]["type"]))
-        descr = nodes.entry("")
-        self._append_markdown_content(descr, param.get("description", ""))
-        tr += descr
-
-        return tr
-
-    def _get_request_table_field_row(self, field, field_name, emitted_fields):
-        """Emit Request description table row for the body element"""
-        if not field:
-            return
-
-        typ = field.get("type")
-        note = None
-        os_ext = field.get("x-openstack", {})
-        if os_ext:
-            min_ver = os_ext.get("min-ver")
-            max_ver = os_ext.get("max-ver")
-            if min_ver:
-                note = f"<br/><strong>New in version {min_ver}</strong>"
-            if max_ver:
-                note = (
-                    f"<br/><strong>Available until version {max_ver}</strong>"
-                )
-        param_descr = f'{field.get("description", "")}{note or ""}'
-
-        if typ == "object" and "properties" in field:
-            if field_name and field_name not in emitted_fields:
-                emitted_fields.add(field_name)
-                tr = nodes.row()
-                tr += nodes.entry("", nodes.paragraph(text=field_name))
-                tr += nodes.entry("", nodes.paragraph(text="body"))
-                tr += nodes.entry(
-                    "", nodes.paragraph(text=field.get("type", ""))
-                )
-                td = nodes.entry("")
-                self._append_markdown_content(td, param_descr)
-                tr += td
-                yield tr
-
-            for k, v in field["properties"].items():
-                for el in self._get_request_table_field_row(
-                    v, f"{field_name}.{k}" if field_name else k, emitted_fields
-                ):
-                    yield el
-        elif typ == "array":
-            pass
-        elif typ:
-            if field_name and field_name not in emitted_fields:
-                emitted_fields.add(field_name)
-                tr = nodes.row()
-                tr += nodes.entry("", nodes.paragraph(text=field_name))
-                tr += nodes.entry("", nodes.paragraph(text="body"))
-                tr += nodes.entry(
-                    "", nodes.paragraph(text=field.get("type", ""))
-                )
-                td = nodes.entry("")
-                self._append_markdown_content(td, param_descr)
-                tr += td
-                yield tr
-        if not typ and "oneOf" in field:
-            opts = field["oneOf"]
-            discriminator = field.get("x-openstack", {}).get("discriminator")
-            if discriminator == "microversion":
-                for opt in opts:
-                    for el in self._get_request_table_field_row(
-                        opt, field_name, emitted_fields
-                    ):
-                        yield el
-            elif discriminator == "action":
-                for opt in opts:
-                    for el in self._get_request_table_field_row(
-                        opt, field_name, emitted_fields
-                    ):
-                        yield el
+        return (
+            param["name"],
+            param["in"],
+            param["schema"]["type"],
+            param.get("description", ""),
+        )
 
     def _get_body_examples(self, sample_key, sample):
         """Add body examples"""
-        p = nodes.paragraph("")
         title = "Example"
         if sample_key:
             title += f" ({sample_key})"
-        p.append(nodes.strong(text=title))
-        yield p
-        pre = nodes.literal_block(
-            "", classes=["javascript", "highlight-javascript"]
+        if not isinstance(sample, str):
+            sample = json.dumps(sample, indent=2, default=str)
+        return openapi_code(
+            title=title, code=sample, language="json", classes=["json"]
+        )
+
+
+# Marker of the pages generated for the groups of the split spec
+SPLIT_PAGE_MARKER = ".. Generated by os_openapi, do not edit."
+
+# `openapi` directive with its options in the reStructuredText source
+_DIRECTIVE_RE = re.compile(
+    r"^(?P<indent>[ \t]*)\.\. openapi::[ \t]*(?P<path>\S+)[ \t]*\n"
+    r"(?P<options>(?:(?P=indent)[ \t]+:[\w-]+:.*\n)*)",
+    re.M,
+)
+
+
+def _get_split_docnames(docname, tags):
+    """Docnames of the pages of the split spec groups by the tag name
+
+    Names of the pages are lowercase, so tags differing only in the case
+    (or in the special characters) get a numeric suffix in the order of
+    the tags to keep their pages apart.
+    """
+    result = {}
+    used = set()
+    for tag in tags:
+        name = re.sub(r"[^\w.-]+", "-", tag["name"]).lower()
+        candidate = name
+        index = 1
+        while candidate in used:
+            index += 1
+            candidate = f"{name}-{index}"
+        used.add(candidate)
+        result[tag["name"]] = f"{docname}/{candidate}"
+    return result
+
+
+def _get_split_page_suffix(config):
+    """File suffix of the generated reStructuredText pages"""
+    for suffix, filetype in config.source_suffix.items():
+        if filetype == "restructuredtext":
+            return suffix
+    return ".rst"
+
+
+def _find_directives(app, docname):
+    """Find the openapi directives in the source of the document
+
+    :returns: list of (path, absolute path, options) of the directives
+        with the raw option values
+    """
+    env = app.env
+    srcpath = env.doc2path(docname)
+    if not os.path.isfile(srcpath):
+        return []
+    with open(srcpath, "rt", encoding=app.config.source_encoding) as fp:
+        source = fp.read()
+    result = []
+    for match in _DIRECTIVE_RE.finditer(source):
+        options = dict(
+            re.findall(r":([\w-]+):[ \t]*(.*)", match.group("options"))
         )
-        pre.append(
-            nodes.literal(
-                text=sample,
-                language="javascript",
-                classes=["highlight", "code"],
+        path = match.group("path")
+        _, abspath = env.relfn2path(path, docname)
+        result.append((path, abspath, options))
+    return result
+
+
+def generate_split_pages(app):
+    """Generate pages for the groups of the specs with `:split: tag`
+
+    Every group of the spec is rendered on its own page placed under the
+    directory named after the document with the directive. Pages are only
+    written when their content changes so that unchanged groups are not
+    rebuilt. Previously generated pages of no longer existing groups or of
+    no longer split specs are removed.
+
+    The pages are generated into the source directory, so they should be
+    ignored by the version control (like `doc/source/*/` of this project).
+    """
+    env = app.env
+    generated = env.os_openapi_split_pages = set()
+    for docname in sorted(env.found_docs):
+        for path, abspath, options in _find_directives(app, docname):
+            if options.get("split", "").strip() != "tag":
+                continue
+            if not path.startswith("/"):
+                path = "/" + posixpath.normpath(
+                    posixpath.join(posixpath.dirname(docname), path)
+                )
+            spec = _get_spec(
+                abspath,
+                app.config.source_encoding,
+                os.path.join(env.doctreedir, "os_openapi"),
             )
+            # Options applying to the groups as well
+            group_options = [
+                f"   :{name}: {options[name].strip()}"
+                for name in ("paths", "operations", "microversion")
+                if name in options
+            ]
+            # Groups are selected like by the directive itself
+            tags = spec.get("tags", [{"name": "default"}])
+            docnames = _get_split_docnames(docname, tags)
+            operation_filter = _get_operation_filter(options)
+            if "tags" in options:
+                tags = [t for t in tags if t["name"] in operation_filter[0]]
+            if "paths" in options or "operations" in options:
+                selected = _select_operations(spec, operation_filter)[0]
+                tag_names = {
+                    tag_name
+                    for path_def in selected["paths"].values()
+                    for method in HTTP_METHODS
+                    if method in path_def
+                    for tag_name in path_def[method].get("tags") or ["default"]
+                }
+                tags = [t for t in tags if t["name"] in tag_names]
+            pages = {}
+            for tag in tags:
+                pages[docnames[tag["name"]]] = "\n".join(
+                    [
+                        SPLIT_PAGE_MARKER,
+                        "",
+                        f".. openapi:: {path}",
+                        f"   :tags: {tag['name']}",
+                        *group_options,
+                        "",
+                    ]
+                )
+            _write_split_pages(app, docname, pages)
+            generated.update(pages)
+    _remove_stale_split_pages(app, generated)
+
+
+def _write_split_pages(app, docname, pages):
+    """Write generated pages of the split spec"""
+    os.makedirs(os.path.join(app.srcdir, docname), exist_ok=True)
+    suffix = _get_split_page_suffix(app.config)
+    for pagename, content in pages.items():
+        path = os.path.join(app.srcdir, pagename + suffix)
+        if os.path.exists(path):
+            with open(path, "rt", encoding="utf-8") as fp:
+                if fp.read() == content:
+                    continue
+        LOG.info("Generating %s", path)
+        with open(path, "wt", encoding="utf-8") as fp:
+            fp.write(content)
+
+
+def _remove_stale_split_pages(app, pages):
+    """Remove generated pages which are not among the current `pages`
+
+    These are the pages of the removed groups and of the specs which are
+    no longer split, which would not be included in any toctree anymore.
+    """
+    env = app.env
+    for docname in sorted(env.found_docs - pages):
+        path = env.doc2path(docname)
+        try:
+            with open(path, "rt", encoding="utf-8") as fp:
+                if fp.read(len(SPLIT_PAGE_MARKER)) != SPLIT_PAGE_MARKER:
+                    continue
+        except (OSError, UnicodeDecodeError):
+            continue
+        LOG.info("Removing stale %s", path)
+        os.unlink(path)
+        env.found_docs.discard(docname)
+        try:
+            # Directory of the pages once all of them are removed
+            os.rmdir(os.path.dirname(path))
+        except OSError:
+            pass
+
+
+def store_operations(app, doctree):
+    """Move nodes of the operations from the doctree to the node stores
+
+    Runs once all transforms and collectors processed the document, so the
+    doctree pickled by Sphinx only holds the `openapi_operation`
+    placeholders.
+    """
+    stores = {}
+    for node in doctree.findall(openapi_operation):
+        children = node.children
+        node.children = []
+        for child in children:
+            # Drop references to the document being read
+            child.parent = None
+            for descendant in child.findall():
+                descendant.document = None
+        markdown = node.attributes.pop("markdown")
+        stores.setdefault(node["store"], {})[node["key"]] = (
+            children,
+            markdown,
         )
-        # TODO(gtema): how to trigger activation of pygments?
-        yield pre
+    for store, operation_nodes in stores.items():
+        path = os.path.join(app.env.doctreedir, store)
+        _save_node_cache(path, operation_nodes)
+        _OPERATION_STORES[path] = operation_nodes
+    if stores:
+        app.env.os_openapi_node_stores[app.env.docname] = {
+            os.path.splitext(os.path.basename(store))[0] for store in stores
+        }
+
+
+# Environment attributes holding values by the docname and whether they are
+# kept for the next builds. Values are dropped once the document is read
+# again or removed, and merged from the parallel readers.
+_DOC_REGISTRIES = {
+    # Statistics of the documents read in this build. Readers forked later
+    # on inherit the statistics merged so far, so only the documents read by
+    # the reader are merged from it.
+    "os_openapi_stats": False,
+    # Names of the node stores, digests of the stored Markdown fragments and
+    # of the highlighted code blocks used by the documents
+    "os_openapi_node_stores": True,
+    "os_openapi_markdown_used": True,
+    "os_openapi_highlights": True,
+}
+
+# Files under `os_openapi` of the doctree directory named after the values
+# of the registries: registry, directory, suffix and description
+_DOC_STORES = (
+    ("os_openapi_node_stores", "nodes", ".pickle", "node stores"),
+    ("os_openapi_markdown_used", "markdown", ".pickle", "Markdown fragments"),
+    ("os_openapi_highlights", "highlight", ".html", "highlighted code blocks"),
+)
+
+
+def init_registries(app):
+    for name, persistent in _DOC_REGISTRIES.items():
+        if not persistent or not hasattr(app.env, name):
+            setattr(app.env, name, {})
+
+
+def purge_registries(app, env, docname):
+    for name in _DOC_REGISTRIES:
+        getattr(env, name).pop(docname, None)
+
+
+def merge_registries(app, env, docnames, other):
+    for name in _DOC_REGISTRIES:
+        registry, other_registry = getattr(env, name), getattr(other, name)
+        for docname in docnames:
+            if docname in other_registry:
+                registry[docname] = other_registry[docname]
+
+
+def remove_stale_files(app, env):
+    """Remove stored files no longer used by any document"""
+    for name, subdir, suffix, description in _DOC_STORES:
+        used = set().union(*getattr(env, name).values())
+        storedir = os.path.join(env.doctreedir, "os_openapi", subdir)
+        if not os.path.isdir(storedir):
+            continue
+        removed = 0
+        for fname in os.listdir(storedir):
+            stem, ext = os.path.splitext(fname)
+            if ext == suffix and stem not in used:
+                os.unlink(os.path.join(storedir, fname))
+                removed += 1
+        if removed:
+            LOG.info("Removed %d stale %s", removed, description)
+
+
+def record_highlights(app, doctree):
+    """Record the code blocks of the document to be highlighted
+
+    Operations reused from the node stores are in the doctree as well, the
+    blocks are only highlighted when the document is written.
+    """
+    digests = {
+        _get_highlight_digest(app.config, node["code"], node["language"])
+        for node in doctree.findall(openapi_code)
+    }
+    if digests:
+        app.env.os_openapi_highlights[app.env.docname] = digests
+
+
+class ExpandOperations(SphinxPostTransform):
+    """Put nodes of the operations back into the doctree being written
+
+    Serial ids of the sections (i.e. responses) are assigned here in the
+    document order, since the same stored nodes may be used repeatedly.
+    """
+
+    # Before any other post transform, so that they process the nodes
+    default_priority = 5
+
+    def run(self, **kwargs: Any) -> None:
+        stores = {}
+        used = set()
+        for node in list(self.document.findall(openapi_operation)):
+            if node.children:
+                node.replace_self(node.children)
+                continue
+            store = node["store"]
+            if store not in stores:
+                path = os.path.join(self.env.doctreedir, store)
+                stores[store] = _OPERATION_STORES.pop(
+                    path, None
+                ) or _load_node_cache(path)
+            key = (store, node["key"])
+            children, _ = stores[store].get(node["key"], (None, None))
+            if children is None:
+                LOG.warning(
+                    "Nodes of the operation are missing in %s, the "
+                    "document needs to be read again",
+                    store,
+                    location=node,
+                )
+                node.parent.remove(node)
+                continue
+            if key in used:
+                children = [child.deepcopy() for child in children]
+            used.add(key)
+            node.replace_self(children)
+
+        serials = collections.Counter()
+        for section in self.document.findall(nodes.section):
+            serial_name = section.attributes.pop("openapi_serial", None)
+            if serial_name:
+                section["ids"].append(f"{serial_name}-{serials[serial_name]}")
+                serials[serial_name] += 1
+
+
+class DeduplicateResponseBodies(SphinxPostTransform):
+    """Render response bodies used repeatedly on the page only once
+
+    The first of the same bodies is moved to a template at the end of the
+    page and all of them are left as placeholders, which the bundled script
+    fills in once the operation is expanded.
+    """
+
+    default_priority = ExpandOperations.default_priority + 1
+    formats = ("html",)
+
+    def run(self, **kwargs: Any) -> None:
+        bodies = collections.defaultdict(list)
+        for node in self.document.findall(openapi_response_body):
+            bodies[node["digest"]].append(node)
+        for digest, occurrences in bodies.items():
+            if len(occurrences) < 2:
+                continue
+            template = openapi_response_template(digest=digest)
+            template.extend(occurrences[0].children)
+            for node in occurrences:
+                node.children = []
+            self.document += template
+
+
+def report_stats(app, exception):
+    stats = sum(app.env.os_openapi_stats.values(), collections.Counter())
+    if exception or not stats:
+        return
+    LOG.info(
+        "Markdown fragments: %d parsed, %d parses saved by the cache, "
+        "%d parses saved as plain text",
+        stats["markdown_parsed"],
+        stats["markdown_cached"],
+        stats["markdown_plain"],
+    )
+    LOG.info(
+        "Operations: %d reused, %d regenerated",
+        stats["operations_reused"],
+        stats["operations_regenerated"],
+    )
+
+
+def warm_caches(app, env, docnames):
+    """Load the specs shared by the documents before the readers fork
+
+    With parallel reading every reader process would otherwise parse,
+    resolve and normalize the same spec on its own. Specs referred by
+    more than one of the documents to be read are loaded by the main
+    process and inherited by all the readers, other specs are left to the
+    readers to be processed in parallel. Specs are told apart by their real
+    path, so that a spec referred through a symlink is not loaded twice.
+    """
+    if not parallel_available or app.parallel <= 1:
+        return
+    env.os_openapi_markdown = {}
+    specs: collections.Counter = collections.Counter()
+    normalized_specs: collections.Counter = collections.Counter()
+    for docname in docnames:
+        for _, abspath, options in _find_directives(app, docname):
+            abspath = os.path.realpath(abspath)
+            specs[abspath] += 1
+            normalized_specs[abspath, _get_operation_filter(options)] += 1
+
+    cachedir = os.path.join(env.doctreedir, "os_openapi")
+    encoding = app.config.source_encoding
+    for (abspath, operation_filter), count in normalized_specs.items():
+        if specs[abspath] < 2:
+            continue
+        try:
+            if count < 2:
+                _get_spec(abspath, encoding, cachedir)
+                continue
+            spec = _get_normalized_spec(
+                abspath,
+                encoding,
+                "file://%s" % abspath,
+                cachedir,
+                operation_filter,
+            )
+        except Exception as ex:
+            # Reported by the directive once the document is read
+            LOG.debug("Not preloading spec %s: %s", abspath, ex)
+            continue
+        _get_operations_by_tag(spec)
+
+
+def merge_caches(app, env, docnames, other):
+    """Add Markdown fragments parsed by the reader to the cache
+
+    Readers forked later on do not parse them again.
+    """
+    for content, children in getattr(other, "os_openapi_markdown", {}).items():
+        if content in _MARKDOWN_CACHE:
+            continue
+        _MARKDOWN_CACHE[content] = children
+        if len(_MARKDOWN_CACHE) > MARKDOWN_CACHE_SIZE:
+            _MARKDOWN_CACHE.popitem(last=False)
+
+
+def forget_merged_caches(app, env):
+    """Keep the merged cache state out of the pickled environment"""
+    env.__dict__.pop("os_openapi_markdown", None)
+
+
+def init_profile(app):
+    """Start collecting the profile when `openapi_profile` is enabled"""
+    global _PROFILE
+    if not app.config.openapi_profile:
+        _PROFILE = None
+        return
+    _PROFILE = {"phases": {}, "operations": []}
+    if app.config.openapi_profile_output:
+        app.os_openapi_cprofile = cProfile.Profile()
+        app.os_openapi_cprofile.enable()
+
+
+def attach_profile(app, doctree):
+    """Pass the profile of the parallel reader back with the environment"""
+    if _PROFILE is not None:
+        app.env.os_openapi_profile = _PROFILE
+
+
+def merge_profile(app, env, docnames, other):
+    profile = getattr(other, "os_openapi_profile", None)
+    if _PROFILE is not None and profile:
+        _merge_profile(_PROFILE, profile)
+
+
+def forget_profile(app, env):
+    """Keep the profile out of the pickled environment"""
+    env.__dict__.pop("os_openapi_profile", None)
+
+
+def report_profile(app, exception):
+    """Report the profile per spec and phase and the slowest operations
+
+    Only the main process is covered by the cProfile output, timings of
+    the parallel readers are merged into the report.
+    """
+    if _PROFILE is None:
+        return
+    cprofile = getattr(app, "os_openapi_cprofile", None)
+    if cprofile:
+        cprofile.disable()
+        path = os.path.join(app.outdir, app.config.openapi_profile_output)
+        cprofile.dump_stats(path)
+        LOG.info("cProfile stats saved to %s", path)
+    if exception:
+        return
+
+    lines = [f"{'spec':<40} {'phase':<32} {'calls':>7} {'cumtime':>9}"]
+    for (spec, phase), (calls, elapsed) in sorted(_PROFILE["phases"].items()):
+        lines.append(f"{spec:<40} {phase:<32} {calls:>7} {elapsed:>9.3f}")
+    lines.append("Slowest operations:")
+    for elapsed, spec, operation in sorted(
+        _PROFILE["operations"], key=lambda x: x[0], reverse=True
+    )[:PROFILE_SLOWEST]:
+        lines.append(f"{elapsed:>9.3f} {spec} {operation}")
+    LOG.info("OpenAPI profile:\n%s", "\n".join(lines))
 
 
 def copy_assets(app, exception):
-    assets = ("bootstrap.min.css", "bootstrap.bundle.min.js", "api-ref.css")
+    assets = (
+        "bootstrap.min.css",
+        "bootstrap.bundle.min.js",
+        "api-ref.css",
+        "api-ref.js",
+    )
     builders = ("html", "readthedocs", "readthedocssinglehtmllocalmedia")
     if app.builder.name not in builders or exception:
         return
@@ -680,8 +2568,13 @@ def add_assets(app):
     app.add_css_file("bootstrap.min.css")
     app.add_css_file("api-ref.css")
     app.add_js_file("bootstrap.bundle.min.js")
+    app.add_js_file("api-ref.js")
 
 
+@_profiled(
+    "visit_openapi_operation_header",
+    spec=lambda self, node: node.get("spec"),
+)
 def visit_openapi_operation_header(self, node):
     """Render a bootstrap accordion for the operation header"""
     tag_id = node["operationId"]
@@ -720,15 +2613,247 @@ def visit_openapi_operation_header(self, node):
     raise nodes.SkipNode
 
 
+def visit_openapi_schema(self, node):
+    """Render the beginning of the schema with a link to the whole schema
+
+    The schema is written to `_static/openapi/schemas` under its content
+    hash, so every distinct schema is only written once. The bundled
+    script replaces the preview with the whole schema on demand.
+    """
+    fname = posixpath.join("_static", "openapi", "schemas", node["digest"])
+    fname += ".json"
+    dest = os.path.join(self.builder.outdir, fname)
+    if not os.path.exists(dest):
+        _write_atomic(dest, node["schema"], "wt")
+
+    uri = relative_uri(
+        self.builder.get_target_uri(self.builder.current_docname), fname
+    )
+    size = len(node["schema"]) / 1024
+    self.body.append('<div class="openapi-schema">')
+    self.body.append(
+        '<pre class="literal-block json">'
+        f'{self.encode(node["preview"])}\n…</pre>'
+    )
+    self.body.append(
+        f'<a class="openapi-schema-load" href="{uri}">'
+        f"Show the whole schema ({size:.0f} KiB)</a>"
+    )
+    self.body.append("</div>")
+
+    raise nodes.SkipNode
+
+
+def visit_openapi_operation_details(self, node):
+    """Render the operation details into a separate file
+
+    Children are rendered as usual, but the resulting HTML is written to
+    `_static/openapi/details` under its content hash and the page only
+    gets the empty accordion body referring to it. The bundled script
+    loads the details when the accordion is expanded.
+    """
+    body = self.body
+    self.body = []
+    for child in node.children:
+        child.walkabout(self)
+    payload = json.dumps({"html": "".join(self.body)}, separators=(",", ":"))
+    self.body = body
+
+    digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+    fname = posixpath.join("_static", "openapi", "details", digest + ".json")
+    dest = os.path.join(self.builder.outdir, fname)
+    if not os.path.exists(dest):
+        _write_atomic(dest, payload, "wt")
+
+    uri = relative_uri(
+        self.builder.get_target_uri(self.builder.current_docname), fname
+    )
+    self.body.append(
+        self.starttag(node, "div", "", **{"data-openapi-details": uri})
+    )
+    self.body.append("</div>\n")
+
+    raise nodes.SkipNode
+
+
+def visit_openapi_fields_table(self, node):
+    """Render the table of the fields directly from the rows payload
+
+    Markup is the same as of the docutils table with a header row.
+    """
+    classes = ["docutils"]
+    classes.extend(
+        cls.strip(" \t\n") for cls in self.settings.table_style.split(",")
+    )
+    classes.append("align-default")
+    self.body.append(self.starttag(node, "table", CLASS=" ".join(classes)))
+    self.body.append('<thead>\n<tr class="row-odd">')
+    self.body.append(
+        "\n".join(
+            f'<th class="head"><p>{col}</p></th>'
+            for col in ("Name", "Location", "Type", "Description")
+        )
+    )
+    self.body.append("\n</tr>\n</thead>\n<tbody>\n")
+    for index, (row, descr) in enumerate(zip(node["rows"], node.children)):
+        row_class = "row-odd" if index % 2 else "row-even"
+        self.body.append(f'<tr class="{row_class}">')
+        for value in row:
+            self.body.append(f"<td><p>{self.encode(value)}</p></td>\n")
+        self.body.append("<td>")
+        for child in descr.children:
+            child.walkabout(self)
+        self.body.append("</td>\n</tr>\n")
+    self.body.append("</tbody>\n</table>\n")
+
+    raise nodes.SkipNode
+
+
+# Maximal number of distinct highlighted code blocks kept in memory
+HIGHLIGHT_CACHE_SIZE = 4096
+
+# Highlighted code blocks (HTML) by the hash of the code
+_HIGHLIGHT_CACHE: collections.OrderedDict[str, str] = collections.OrderedDict()
+
+
+def _get_highlight_digest(config, code, lang):
+    """Hash of the code together with everything its highlighting depends on"""
+    opts = config.highlight_options.get(lang, {})
+    return hashlib.sha256(
+        f"{__version__}:{sphinx.__version__}:{pygments.__version__}:{lang}:"
+        f"{sorted(opts.items())}:{code}".encode("utf-8")
+    ).hexdigest()[:32]
+
+
+def _highlight_code(self, node, code, lang):
+    """Highlight the code with Pygments once per distinct code
+
+    Highlighted HTML is cached in memory and in `os_openapi/highlight` of
+    the doctree directory by `_get_highlight_digest`, so that the same
+    schemas and examples are not highlighted again neither in the same
+    build nor in the next builds. Blocks no longer in any document are
+    removed (see `remove_stale_files`).
+    """
+    opts = self.config.highlight_options.get(lang, {})
+    digest = _get_highlight_digest(self.config, code, lang)
+    highlighted = _HIGHLIGHT_CACHE.get(digest)
+    if highlighted is not None:
+        _HIGHLIGHT_CACHE.move_to_end(digest)
+        return highlighted
+
+    path = os.path.join(
+        self.builder.doctreedir, "os_openapi", "highlight", digest + ".html"
+    )
+    try:
+        with open(path, encoding="utf-8") as fp:
+            highlighted = fp.read()
+    except FileNotFoundError:
+        highlighted = self.highlighter.highlight_block(
+            code, lang, opts=opts, location=node
+        )
+        _write_atomic(path, highlighted, "wt")
+
+    _HIGHLIGHT_CACHE[digest] = highlighted
+    if len(_HIGHLIGHT_CACHE) > HIGHLIGHT_CACHE_SIZE:
+        _HIGHLIGHT_CACHE.popitem(last=False)
+    return highlighted
+
+
+def visit_openapi_code(self, node):
+    """Render the highlighted code like a literal block"""
+    if node.get("title"):
+        self.body.append(
+            f"<p><strong>{self.encode(node['title'])}</strong></p>\n"
+        )
+    lang = node["language"]
+    highlighted = _highlight_code(self, node, node["code"], lang)
+    self.body.append(
+        self.starttag(
+            node, "div", suffix="", CLASS=f"highlight-{lang} notranslate"
+        )
+    )
+    self.body.append(highlighted + "</div>\n")
+
+    raise nodes.SkipNode
+
+
+def visit_openapi_response_body(self, node):
+    """Render the placeholder of the body rendered once per page"""
+    if node.children:
+        return
+    self.body.append(
+        '<div class="openapi-response-body" data-openapi-template='
+        f'"openapi-response-{node["digest"]}"></div>\n'
+    )
+
+    raise nodes.SkipNode
+
+
+def depart_openapi_response_body(self, node):
+    pass
+
+
+def visit_openapi_response_template(self, node):
+    self.body.append(f'<template id="openapi-response-{node["digest"]}">')
+
+
+def depart_openapi_response_template(self, node):
+    self.body.append("</template>\n")
+
+
 def setup(app) -> dict[str, bool]:
     app.add_node(
         openapi_operation_header, html=(visit_openapi_operation_header, None)
     )
+    app.add_node(openapi_schema, html=(visit_openapi_schema, None))
+    app.add_node(
+        openapi_operation_details,
+        html=(visit_openapi_operation_details, None),
+    )
+    app.add_node(openapi_fields_table, html=(visit_openapi_fields_table, None))
+    app.add_node(openapi_code, html=(visit_openapi_code, None))
+    app.add_node(
+        openapi_response_body,
+        html=(visit_openapi_response_body, depart_openapi_response_body),
+    )
+    app.add_node(
+        openapi_response_template,
+        html=(
+            visit_openapi_response_template,
+            depart_openapi_response_template,
+        ),
+    )
+    app.add_node(openapi_operation)
+    app.add_post_transform(ExpandOperations)
+    app.add_post_transform(DeduplicateResponseBodies)
     # This specifies all our directives that we're adding
     app.add_directive("openapi", OpenApiDirective)
     # app.add_directive('openapi_group', OpenApiGroupDirective)
 
+    app.add_config_value("openapi_parallel_workers", 0, "env", [int])
+    app.add_config_value("openapi_schema_inline_size", 4096, "env", [int])
+    app.add_config_value("openapi_schema_preview_size", 2048, "env", [int])
+    app.add_config_value("openapi_lazy_details", False, "env", [bool])
+    app.add_config_value("openapi_profile", False, "", [bool])
+    app.add_config_value("openapi_profile_output", None, "", [str])
     app.connect("builder-inited", add_assets)
+    app.connect("builder-inited", init_profile)
+    app.connect("builder-inited", generate_split_pages)
+    app.connect("builder-inited", init_registries)
+    app.connect("env-before-read-docs", warm_caches)
+    # After the collectors (priority 500) processed the operation nodes
+    app.connect("doctree-read", store_operations, priority=900)
+    app.connect("doctree-read", record_highlights, priority=800)
+    app.connect("env-purge-doc", purge_registries)
+    app.connect("env-merge-info", merge_registries)
+    app.connect("env-updated", remove_stale_files)
+    app.connect("env-merge-info", merge_caches)
+    app.connect("env-updated", forget_merged_caches)
+    app.connect("build-finished", report_stats)
+    app.connect("doctree-read", attach_profile)
+    app.connect("env-merge-info", merge_profile)
+    app.connect("env-updated", forget_profile)
+    app.connect("build-finished", report_profile)
     # This copies all the assets (css, js, fonts) over to the build
     # _static directory during final build.
     app.connect("build-finished", copy_assets)
@@ -0,0 +1,50 @@
+/* Load the whole JSON schema in place of its preview on demand */
+document.addEventListener("click", function (event) {
+  const link = event.target.closest(".openapi-schema-load");
+  if (!link) {
+    return;
+  }
+  event.preventDefault();
+  fetch(link.href)
+    .then((response) => response.json())
+    .then((schema) => {
+      const pre = link.parentElement.querySelector("pre");
+      pre.textContent = JSON.stringify(schema, null, 2);
+      link.remove();
+    })
+    .catch(() => {
+      // fetch is not available for local files, open the schema instead
+      window.location.href = link.href;
+    });
+});
+
+/* Fill in the response bodies rendered only once per page */
+function fillResponseBodies(element) {
+  element.querySelectorAll("[data-openapi-template]").forEach((body) => {
+    const template = document.getElementById(body.dataset.openapiTemplate);
+    if (template) {
+      body.replaceWith(template.content.cloneNode(true));
+    }
+  });
+}
+
+/* Load details of the operation once its accordion is expanded */
+document.addEventListener("show.bs.collapse", function (event) {
+  const details = event.target;
+  const uri = details.dataset.openapiDetails;
+  if (!uri) {
+    fillResponseBodies(details);
+    return;
+  }
+  delete details.dataset.openapiDetails;
+  fetch(uri)
+    .then((response) => response.json())
+    .then((payload) => {
+      details.innerHTML = payload.html;
+      fillResponseBodies(details);
+    })
+    .catch(() => {
+      details.dataset.openapiDetails = uri;
+      details.textContent = "Failed to load the operation details.";
+    });
+});
@@ -0,0 +1,54 @@
+import io
+import os
+
+import pytest
+from sphinx.application import Sphinx
+
+SPECS_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "specs"
+)
+
+
+@pytest.fixture
+def placement_spec():
+    """Content of the placement spec"""
+    with open(os.path.join(SPECS_DIR, "placement", "v1.yaml")) as fp:
+        return fp.read()
+
+
+@pytest.fixture
+def build(tmp_path):
+    """Build the project of the given source files with the html builder
+
+    The project is kept in `source`, `html` and `doctrees` of `path`
+    (`tmp_path` by default). Only changed files are written, so that only
+    their documents are read again by the next build. `conf.py` enabling
+    the extension is written unless given.
+
+    :returns: tuple of the application and the warnings of the build
+    """
+
+    def _build(files, parallel=0, path=None):
+        path = path or tmp_path
+        srcdir = path / "source"
+        srcdir.mkdir(parents=True, exist_ok=True)
+        files = {"conf.py": 'extensions = ["os_openapi"]\n', **files}
+        for name, content in files.items():
+            file_path = srcdir / name
+            if not file_path.exists() or file_path.read_text() != content:
+                file_path.write_text(content)
+        warning = io.StringIO()
+        app = Sphinx(
+            str(srcdir),
+            str(srcdir),
+            str(path / "html"),
+            str(path / "doctrees"),
+            "html",
+            status=None,
+            warning=warning,
+            parallel=parallel,
+        )
+        app.build()
+        return app, warning.getvalue()
+
+    return _build
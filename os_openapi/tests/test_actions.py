@@ -0,0 +1,79 @@
+import json
+
+import os_openapi
+
+
+def _get_action_body(action_name, **x_openstack):
+    return {
+        "type": "object",
+        "properties": {action_name: {"type": ["object", "null"]}},
+        "x-openstack": x_openstack,
+    }
+
+
+REBOOT = _get_action_body("reboot", **{"action-name": "reboot"})
+# Requests without the action name are named by their only property
+CREATE_IMAGE = _get_action_body("createImage")
+CREATE_IMAGE_RESPONSE = {
+    "type": "object",
+    "properties": {"image_id": {"type": "string"}},
+    "x-openstack": {"action-name": "createImage"},
+}
+
+ACTION = {
+    "operationId": "servers/id/action:post",
+    "tags": ["Servers"],
+    "requestBody": {
+        "content": {
+            "application/json": {
+                "schema": {
+                    "oneOf": [REBOOT, CREATE_IMAGE],
+                    "x-openstack": {"discriminator": "action"},
+                }
+            }
+        }
+    },
+    "responses": {
+        "202": {
+            "description": "Accepted",
+            "content": {
+                "application/json": {
+                    "schema": {"oneOf": [CREATE_IMAGE_RESPONSE]}
+                }
+            },
+        },
+        "404": {"description": "Not Found"},
+    },
+}
+
+
+def test_action_bodies_by_action_name():
+    assert os_openapi._get_action_bodies(ACTION) == {
+        "reboot": (REBOOT, {"202": None}),
+        "createImage": (CREATE_IMAGE, {"202": CREATE_IMAGE_RESPONSE}),
+    }
+
+
+def test_not_an_action():
+    operation = {"requestBody": {}, "responses": ACTION["responses"]}
+    assert os_openapi._get_action_bodies(operation) == {}
+
+
+def test_missing_action_response_body_noted(build, tmp_path):
+    spec = {
+        "openapi": "3.1.0",
+        "info": {"title": "Test", "version": "1.0"},
+        "tags": [{"name": "Servers"}],
+        "paths": {"/servers/{id}/action": {"post": ACTION}},
+    }
+    build(
+        {
+            "spec.json": json.dumps(spec),
+            "index.rst": "Index\n=====\n\n.. openapi:: spec.json\n",
+        }
+    )
+
+    html = (tmp_path / "html" / "index.html").read_text()
+    note = "No body of this response is described for the action."
+    assert html.count(note) == 1
+    assert "image_id" in html
@@ -0,0 +1,60 @@
+import os_openapi
+
+
+def _object(**properties):
+    return {"type": "object", "properties": properties}
+
+
+def test_array_items_named_after_array():
+    schema = _object(
+        servers={
+            "type": "array",
+            "description": "Servers",
+            "items": _object(
+                id={"type": "string", "description": "Id"},
+                links={
+                    "type": "array",
+                    "items": _object(href={"type": "string"}),
+                },
+            ),
+        }
+    )
+    assert os_openapi._get_field_rows(schema) == [
+        ("servers", "body", "array", "Servers"),
+        ("servers[].id", "body", "string", "Id"),
+        ("servers[].links", "body", "array", ""),
+        ("servers[].links[].href", "body", "string", ""),
+    ]
+
+
+def test_top_level_array_items():
+    schema = {"type": "array", "items": _object(id={"type": "string"})}
+    assert os_openapi._get_field_rows(schema) == [
+        ("[].id", "body", "string", "")
+    ]
+
+
+def test_first_microversion_option_wins():
+    schema = {
+        "oneOf": [
+            _object(
+                name={
+                    "type": "string",
+                    "description": "Name",
+                    "x-openstack": {"max-ver": "2.18"},
+                }
+            ),
+            _object(name={"type": "string", "description": "New name"}),
+        ],
+        "x-openstack": {"discriminator": "microversion"},
+    }
+    rows = os_openapi._get_field_rows(schema)
+    assert rows == [
+        (
+            "name",
+            "body",
+            "string",
+            "Name<br/><strong>Available until version 2.18</strong>",
+        )
+    ]
+    assert os_openapi._get_field_rows(schema) is rows
@@ -0,0 +1,98 @@
+import copy
+import json
+
+from docutils import nodes
+import pytest
+
+import os_openapi
+from os_openapi.tests.test_split import SPEC
+
+
+def _get_operation(schema):
+    body = {"application/json": {"schema": {"$ref": schema}}}
+    return {"responses": {"200": {"description": "OK", "content": body}}}
+
+
+REFS_SPEC = {
+    "paths": {
+        "/servers": {
+            "get": _get_operation("#/components/schemas/Server"),
+            "parameters": [{"name": "limit", "in": "query"}],
+        },
+        "/ports": {"get": _get_operation("#/components/schemas/Port")},
+    },
+    "components": {
+        "schemas": {
+            "Server": {
+                "type": "object",
+                "properties": {
+                    "flavor": {"$ref": "#/components/schemas/Flavor"}
+                },
+            },
+            "Flavor": {"type": "object"},
+            "Port": {"type": "object"},
+        }
+    },
+}
+
+
+@pytest.fixture
+def build_index(build):
+    def _build_index(index):
+        return build({"spec.json": json.dumps(SPEC), "index.rst": index})
+
+    return _build_index
+
+
+def test_filter_selecting_nothing_warns(build_index):
+    _, warning = build_index(
+        "Index\n=====\n\n.. openapi:: spec.json\n   :paths: /flavors\n",
+    )
+    assert "index.rst:4: WARNING: No operations of spec.json" in warning
+    assert ":paths: /flavors" in warning
+
+
+def test_tags_keep_spec_header(build_index, tmp_path):
+    app, warning = build_index(
+        "Index\n=====\n\n.. openapi:: spec.json\n   :tags: Ports\n"
+    )
+    assert "No operations" not in warning
+    doctree = app.env.get_doctree("index")
+    assert list(doctree.findall(nodes.version))
+    html = (tmp_path / "html" / "index.html").read_text()
+    assert "/ports" in html
+    assert "/servers" not in html
+
+
+def test_split_pages_without_spec_header(build_index):
+    app, _ = build_index(
+        "Index\n=====\n\n.. openapi:: spec.json\n   :split: tag\n"
+    )
+    assert list(app.env.get_doctree("index").findall(nodes.version))
+    doctree = app.env.get_doctree("index/ports")
+    assert not list(doctree.findall(nodes.version))
+
+
+def test_selected_refs_resolved_without_modifying_referrer():
+    spec = copy.deepcopy(REFS_SPEC)
+    operation_filter = os_openapi._get_operation_filter({"paths": "/servers"})
+    selected, count, total = os_openapi._select_operations(
+        spec, operation_filter
+    )
+    assert (count, total) == (1, 2)
+    assert list(selected["paths"]) == ["/servers"]
+    assert "components" not in selected
+    assert selected["paths"]["/servers"]["parameters"] == [
+        {"name": "limit", "in": "query"}
+    ]
+
+    resolved = os_openapi._resolve_refs(
+        "", copy.deepcopy(selected), referrer=spec
+    )
+    response = resolved["paths"]["/servers"]["get"]["responses"]["200"]
+    schema = response["content"]["application/json"]["schema"]
+    assert schema == {
+        "type": "object",
+        "properties": {"flavor": {"type": "object"}},
+    }
+    assert spec == REFS_SPEC
@@ -0,0 +1,77 @@
+import collections
+import json
+import os
+
+import os_openapi
+
+SPEC = {
+    "openapi": "3.1.0",
+    "info": {"title": "Test", "version": "1.0"},
+    "paths": {
+        "/servers": {
+            "post": {
+                "operationId": "servers:create",
+                "requestBody": {
+                    "content": {
+                        "application/json": {
+                            "schema": {
+                                "type": "object",
+                                "properties": {"name": {"type": "string"}},
+                                "additionalProperties": False,
+                                "examples": {"Create": {"name": None}},
+                            }
+                        }
+                    }
+                },
+                "responses": {"202": {"description": "Accepted"}},
+            }
+        }
+    },
+}
+
+
+def test_code_highlighted_as_json(build, tmp_path):
+    build(
+        {
+            "spec.json": json.dumps(SPEC),
+            "index.rst": "Index\n=====\n\n.. openapi:: spec.json\n",
+        }
+    )
+
+    html = (tmp_path / "html" / "index.html").read_text()
+    assert 'class="json highlight-json notranslate"' in html
+    # Schema
+    assert '<span class="kc">false</span>' in html
+    # Example rendered as JSON rather than Python
+    assert '<span class="kc">null</span>' in html
+    assert "None" not in html
+
+
+def test_stale_highlighted_code_removed(
+    build, placement_spec, tmp_path, monkeypatch
+):
+    # Blocks highlighted by the previous tests are not stored again
+    monkeypatch.setattr(
+        os_openapi, "_HIGHLIGHT_CACHE", collections.OrderedDict()
+    )
+    highlight_dir = tmp_path / "doctrees" / "os_openapi" / "highlight"
+
+    def build_index(index):
+        build({"v1.yaml": placement_spec, "index.rst": index})
+        return sorted(os.listdir(highlight_dir))
+
+    blocks = build_index("Index\n=====\n\n.. openapi:: v1.yaml\n")
+    assert blocks
+
+    assert (
+        build_index("Index\n=====\n\nIntroduction.\n\n.. openapi:: v1.yaml\n")
+        == blocks
+    )
+
+    new_blocks = build_index(
+        "Index\n=====\n\n.. openapi:: v1.yaml\n   :tags: traits\n"
+    )
+    assert new_blocks
+    assert set(new_blocks) < set(blocks)
+
+    assert build_index("Index\n=====\n\nIntroduction.\n") == []
@@ -0,0 +1,34 @@
+from ruamel.yaml import YAML
+import pytest
+
+import os_openapi
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "on",
+        "yes",
+        "no",
+        "True",
+        "017",
+        "0o17",
+        "0x1F",
+        "~",
+        "",
+        '"true"',
+        "1_000",
+        "0b101",
+        "-0o17",
+        "+0x1F",
+        "1_000.5",
+        ".5",
+        "2001-12-14",
+    ],
+)
+def test_scalars_resolved_like_ruamel(value):
+    data = f"value: {value}\n".encode("utf-8")
+    expected = YAML(typ="safe").load(data.decode("utf-8"))["value"]
+    loaded = os_openapi._load_spec(data, "utf-8")["value"]
+    assert loaded == expected
+    assert type(loaded) is type(expected)
@@ -0,0 +1,42 @@
+import pytest
+
+from docutils import nodes
+from myst_parser.mdit_to_docutils.base import make_document
+from myst_parser.parsers.docutils_ import Parser
+
+import os_openapi
+
+
+def _is_plain_paragraph(content):
+    """Whether myst renders the content as a single plain paragraph"""
+    document = make_document(parser_cls=Parser)
+    Parser().parse(content, document)
+    return (
+        len(document.children) == 1
+        and isinstance(document[0], nodes.paragraph)
+        and all(isinstance(x, nodes.Text) for x in document[0].children)
+        and document[0].astext() == content
+    )
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        "Plain text",
+        "Size in GiB (1.5 or 2).",
+        "Version 2. Next one",
+        "1.Foo",
+        "2024 was the year",
+    ],
+)
+def test_plain_text_fast_path(content):
+    assert os_openapi._PLAIN_TEXT_RE.fullmatch(content)
+    assert _is_plain_paragraph(content)
+
+
+@pytest.mark.parametrize(
+    "content", ["1. Foo", "2) bar", "10. Ten", "1.", "3)"]
+)
+def test_ordered_list_not_plain_text(content):
+    assert not _is_plain_paragraph(content)
+    assert not os_openapi._PLAIN_TEXT_RE.fullmatch(content)
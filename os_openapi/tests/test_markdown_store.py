@@ -0,0 +1,64 @@
+import collections
+import os
+
+import pytest
+
+import os_openapi
+
+
+@pytest.fixture(autouse=True)
+def markdown_cache(monkeypatch):
+    # Fragments parsed by the previous tests are not stored again
+    monkeypatch.setattr(
+        os_openapi, "_MARKDOWN_CACHE", collections.OrderedDict()
+    )
+
+
+@pytest.fixture
+def build_docs(build, placement_spec, tmp_path):
+    def _build_docs(docs, parallel):
+        """Build the documents and return the stored Markdown fragments"""
+        files = {
+            "v1.yaml": placement_spec,
+            "index.rst": "Index\n=====\n\n.. toctree::\n\n"
+            + "".join(f"   {d}\n" for d in docs),
+        }
+        for name, content in docs.items():
+            files[f"{name}.rst"] = f"{name}\n{'=' * len(name)}\n\n{content}"
+        build(files, parallel)
+        markdown_dir = tmp_path / "doctrees" / "os_openapi" / "markdown"
+        if not markdown_dir.exists():
+            return set()
+        return set(os.listdir(markdown_dir))
+
+    return _build_docs
+
+
+def test_fragments_not_stored_by_serial_read(build_docs):
+    docs = {"first": ".. openapi:: v1.yaml\n"}
+    assert build_docs(docs, 1) == set()
+
+
+def test_stale_fragments_removed(build_docs, tmp_path):
+    docs = {
+        "first": ".. openapi:: v1.yaml\n",
+        "second": ".. openapi:: v1.yaml\n   :tags: traits\n",
+    }
+    fragments = build_docs(docs, 2)
+    assert fragments
+
+    # Fragments of the operations reused from the node stores are kept
+    os.utime(tmp_path / "source" / "v1.yaml")
+    assert build_docs(docs, 2) == fragments
+
+    # Fragments of the documents not read again are kept
+    docs["second"] = "Introduction.\n"
+    assert build_docs(docs, 2) == fragments
+
+    docs["first"] = ".. openapi:: v1.yaml\n   :tags: traits\n"
+    new_fragments = build_docs(docs, 2)
+    assert new_fragments
+    assert new_fragments < fragments
+
+    docs["first"] = "Introduction.\n"
+    assert build_docs(docs, 2) == set()
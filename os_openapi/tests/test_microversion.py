@@ -0,0 +1,52 @@
+import os_openapi
+
+SERVER = {
+    "type": "object",
+    "properties": {
+        "name": {"type": "string"},
+        "description": {
+            "type": "string",
+            "x-openstack": {"min-ver": "2.19"},
+        },
+    },
+    "required": ["name", "description"],
+}
+
+OLD_BODY = {"type": "object", "x-openstack": {"max-ver": "2.18"}}
+NEW_BODY = {"type": "object", "x-openstack": {"min-ver": "2.19"}}
+
+BODY = {
+    "oneOf": [OLD_BODY, NEW_BODY],
+    "x-openstack": {"discriminator": "microversion"},
+}
+
+
+def _prune(node, version):
+    spec = {"paths": {}, "components": {"schemas": {"node": node}}}
+    return os_openapi._prune_to_version(
+        spec, node, os_openapi._parse_version(version)
+    )
+
+
+def test_required_trimmed_to_available_properties():
+    pruned = _prune(SERVER, "2.1")
+    assert list(pruned["properties"]) == ["name"]
+    assert list(pruned["required"]) == ["name"]
+    assert SERVER["required"] == ["name", "description"]
+
+
+def test_unchanged_node_kept():
+    assert _prune(SERVER, "2.19") is SERVER
+
+
+def test_microversion_one_of_collapsed():
+    assert _prune(BODY, "2.1") is OLD_BODY
+    assert _prune(BODY, "2.19") is NEW_BODY
+
+
+def test_one_of_without_matching_branch_unavailable():
+    body = {
+        "oneOf": [NEW_BODY],
+        "x-openstack": {"discriminator": "microversion"},
+    }
+    assert _prune(body, "2.1") is os_openapi._UNAVAILABLE
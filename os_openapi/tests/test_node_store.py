@@ -0,0 +1,36 @@
+import os
+
+import pytest
+
+
+@pytest.fixture
+def build_index(build, placement_spec, tmp_path):
+    def _build_index(index):
+        """Build the index and return its statistics and node stores"""
+        app, _ = build({"v1.yaml": placement_spec, "index.rst": index})
+        stores = os.listdir(tmp_path / "doctrees" / "os_openapi" / "nodes")
+        return app.env.os_openapi_stats.get("index"), sorted(stores)
+
+    return _build_index
+
+
+def test_node_store_kept_on_edits_around_directive(build_index):
+    stats, stores = build_index("Index\n=====\n\n.. openapi:: v1.yaml\n")
+    assert stats["operations_reused"] == 0
+    assert len(stores) == 1
+
+    stats, new_stores = build_index(
+        "Index\n=====\n\nIntroduction.\n\n.. openapi:: v1.yaml\n"
+    )
+    assert stats["operations_regenerated"] == 0
+    assert stats["operations_reused"] > 0
+    assert new_stores == stores
+
+
+def test_stale_node_store_removed(build_index):
+    _, stores = build_index("Index\n=====\n\n.. openapi:: v1.yaml\n")
+    _, new_stores = build_index(
+        "Index\n=====\n\n.. openapi:: v1.yaml\n   :microversion: 1.10\n",
+    )
+    assert len(new_stores) == 1
+    assert new_stores != stores
@@ -0,0 +1,33 @@
+import os
+
+import os_openapi
+
+
+def test_spec_normalized_once_for_two_directives(
+    build, placement_spec, tmp_path, monkeypatch
+):
+    files = {
+        "v1.yaml": placement_spec,
+        "index.rst": "Index\n=====\n\n"
+        ".. toctree::\n\n   first\n   second\n",
+    }
+    for name in ("first", "second"):
+        files[f"{name}.rst"] = (
+            f"{name}\n{'=' * len(name)}\n\n.. openapi:: v1.yaml\n"
+        )
+
+    calls = []
+    normalize_spec = os_openapi.normalize_spec
+
+    def counting_normalize_spec(spec, **options):
+        calls.append(options["uri"])
+        return normalize_spec(spec, **options)
+
+    monkeypatch.setattr(os_openapi, "normalize_spec", counting_normalize_spec)
+    build(files)
+
+    spec_path = os.path.realpath(tmp_path / "source" / "v1.yaml")
+    assert calls == [f"file://{spec_path}"]
+    for name in ("first", "second"):
+        html = (tmp_path / "html" / f"{name}.html").read_text()
+        assert "operation-path" in html
@@ -0,0 +1,28 @@
+import os_openapi
+
+DOCS = ("first", "second", "third", "fourth")
+
+
+def test_parallel_profile_counts_each_operation_once(
+    build, placement_spec, tmp_path
+):
+    files = {
+        "v1.yaml": placement_spec,
+        "conf.py": 'extensions = ["os_openapi"]\nopenapi_profile = True\n',
+        "index.rst": "Index\n=====\n\n.. toctree::\n\n"
+        + "".join(f"   {d}\n" for d in DOCS),
+    }
+    for name in DOCS:
+        files[f"{name}.rst"] = (
+            f"{name}\n{'=' * len(name)}\n\n.. openapi:: v1.yaml\n"
+        )
+
+    serial, _ = build(files, 1, tmp_path / "serial")
+    operations = len(os_openapi._PROFILE["operations"])
+    assert operations > 0
+    assert "os_openapi_profile" not in serial.env.__dict__
+
+    app, _ = build(files, 2, tmp_path / "parallel")
+
+    assert len(os_openapi._PROFILE["operations"]) == operations
+    assert "os_openapi_profile" not in app.env.__dict__
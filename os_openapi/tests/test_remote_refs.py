@@ -0,0 +1,82 @@
+import http.server
+import threading
+
+import pytest
+
+import os_openapi
+
+DOCUMENTS = {
+    "/common.yaml": (
+        b"components:\n"
+        b"  schemas:\n"
+        b"    Server:\n"
+        b"      type: object\n"
+        b"      properties:\n"
+        b"        flavor:\n"
+        b"          $ref: 'flavor.yaml#/Flavor'\n"
+    ),
+    "/flavor.yaml": b"Flavor:\n  type: string\n",
+}
+
+
+@pytest.fixture
+def server():
+    requests = []
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            requests.append(self.path)
+            content = DOCUMENTS.get(self.path)
+            if content is None:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+
+        def log_message(self, format, *args):
+            pass
+
+    httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{httpd.server_port}", requests
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+def test_remote_refs_fetched_once(server, tmp_path):
+    base_url, requests = server
+    ref = {"$ref": f"{base_url}/common.yaml#/components/schemas/Server"}
+    spec = {"paths": {"/servers": {"get": {"schema": ref}}}}
+
+    spec = os_openapi._resolve_refs(
+        f"file://{tmp_path}/spec.yaml", spec, str(tmp_path / "remote")
+    )
+
+    assert spec["paths"]["/servers"]["get"]["schema"] == {
+        "type": "object",
+        "properties": {"flavor": {"type": "string"}},
+    }
+    assert sorted(requests) == ["/common.yaml", "/flavor.yaml"]
+
+
+def test_no_remote_refs_fetch_nothing(monkeypatch, tmp_path):
+    def fail(*args, **kwargs):
+        raise AssertionError("remote fetching set up")
+
+    monkeypatch.setattr(os_openapi.OpenApiRefResolver, "get_session", fail)
+    monkeypatch.setattr(
+        os_openapi.concurrent.futures, "ThreadPoolExecutor", fail
+    )
+    spec = {
+        "paths": {"/servers": {"get": {"$ref": "#/components/get"}}},
+        "components": {"get": {"summary": "List servers"}},
+    }
+
+    spec = os_openapi._resolve_refs(f"file://{tmp_path}/spec.yaml", spec)
+
+    assert spec["paths"]["/servers"]["get"] == {"summary": "List servers"}
@@ -0,0 +1,24 @@
+import os_openapi
+
+
+def test_spec_read_once(placement_spec, tmp_path, monkeypatch):
+    # Distinct content, so that the spec is not cached by previous tests
+    path = tmp_path / "v1.yaml"
+    path.write_text(f"# {tmp_path}\n{placement_spec}")
+
+    calls = []
+    read_spec = os_openapi._read_spec
+
+    def counting_read_spec(abspath, encoding):
+        calls.append(abspath)
+        return read_spec(abspath, encoding)
+
+    monkeypatch.setattr(os_openapi, "_read_spec", counting_read_spec)
+    spec = os_openapi._get_normalized_spec(
+        str(path), None, f"file://{path}", str(tmp_path / "cache")
+    )
+    assert spec["info"]["title"]
+    assert len(calls) == 1
+
+    os_openapi._get_spec(str(path), None)
+    assert len(calls) == 1
@@ -0,0 +1,72 @@
+import json
+
+import os_openapi
+
+
+def _get_operation(operation_id, tag):
+    return {
+        "operationId": operation_id,
+        "tags": [tag],
+        "responses": {"200": {"description": "OK"}},
+    }
+
+
+SPEC = {
+    "openapi": "3.1.0",
+    "info": {"title": "Test", "version": "1.0"},
+    "tags": [{"name": "Servers"}, {"name": "servers"}, {"name": "Ports"}],
+    "paths": {
+        "/servers": {"get": _get_operation("servers:list", "Servers")},
+        "/v2/servers": {"get": _get_operation("servers2:list", "servers")},
+        "/ports": {"get": _get_operation("ports:list", "Ports")},
+    },
+}
+
+
+def test_split_docnames_differing_in_case():
+    assert os_openapi._get_split_docnames("api", SPEC["tags"]) == {
+        "Servers": "api/servers",
+        "servers": "api/servers-2",
+        "Ports": "api/ports",
+    }
+
+
+def test_split_pages_use_source_suffix(build, tmp_path):
+    build(
+        {
+            "spec.json": json.dumps(SPEC),
+            "conf.py": 'extensions = ["os_openapi"]\n'
+            'source_suffix = {".txt": "restructuredtext"}\n',
+            "index.txt": "Index\n=====\n\n.. openapi:: spec.json\n"
+            "   :split: tag\n",
+        }
+    )
+
+    srcdir = tmp_path / "source"
+    assert sorted(x.name for x in (srcdir / "index").iterdir()) == [
+        "ports.txt",
+        "servers-2.txt",
+        "servers.txt",
+    ]
+    html = (tmp_path / "html" / "index" / "servers-2.html").read_text()
+    assert "/v2/servers" in html
+    html = (tmp_path / "html" / "index" / "servers.html").read_text()
+    assert "/v2/servers" not in html
+
+
+def test_split_pages_removed_once_not_split(build, tmp_path):
+    srcdir = tmp_path / "source"
+    index = "Index\n=====\n\n.. openapi:: spec.json\n"
+    build(
+        {
+            "spec.json": json.dumps(SPEC),
+            "index.rst": index + "   :split: tag\n",
+        }
+    )
+    assert (srcdir / "index" / "ports.rst").exists()
+
+    app, warning = build({"index.rst": index})
+
+    assert not (srcdir / "index").exists()
+    assert sorted(app.env.found_docs) == ["index"]
+    assert "isn't included in any toctree" not in warning
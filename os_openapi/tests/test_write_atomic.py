@@ -0,0 +1,22 @@
+import os
+
+import pytest
+
+import os_openapi
+
+
+def test_write_atomic(tmp_path):
+    path = tmp_path / "cache" / "entry.json"
+    os_openapi._write_atomic(str(path), "{}", "wt")
+    os_openapi._write_atomic(str(path), '{"a": 1}', "wt")
+    assert path.read_text() == '{"a": 1}'
+    assert os.listdir(path.parent) == ["entry.json"]
+
+
+def test_write_atomic_failure_cleaned_up(tmp_path):
+    path = tmp_path / "entry.pickle"
+    path.write_bytes(b"old")
+    with pytest.raises(TypeError):
+        os_openapi._write_atomic(str(path), "not bytes", "wb")
+    assert path.read_bytes() == b"old"
+    assert os.listdir(tmp_path) == ["entry.pickle"]
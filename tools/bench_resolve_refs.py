@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark ``$ref`` resolution of the specs.
+
+Compares resolution time and peak memory of the memoized
+``os_openapi._resolve_refs`` with the previous implementation, which
+re-expanded the referenced object at every place referring to it.
+
+Usage::
+
+    python tools/bench_resolve_refs.py [SPEC ...]
+
+By default all specs under ``specs/`` are processed.
+"""
+
+import argparse
+import collections.abc
+import copy
+import glob
+import os
+import sys
+import time
+import tracemalloc
+
+# Run from the checkout without installing the package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import os_openapi  # noqa: E402
+
+
+def legacy_resolve_refs(uri, spec):
+    """Previous implementation of ``os_openapi._resolve_refs``"""
+    resolver = os_openapi.OpenApiRefResolver(uri, spec)
+
+    def _do_resolve(node, seen=[]):
+        if isinstance(node, collections.abc.Mapping) and "$ref" in node:
+            ref = node["$ref"]
+            with resolver.resolving(ref) as resolved:
+                if ref in seen:
+                    return {"type": "object"}
+                return _do_resolve(resolved, seen + [ref])
+        elif isinstance(node, collections.abc.Mapping):
+            for k, v in node.items():
+                node[k] = _do_resolve(v, seen)
+        elif isinstance(node, (list, tuple)):
+            for i in range(len(node)):
+                node[i] = _do_resolve(node[i], seen)
+        return node
+
+    return _do_resolve(spec)
+
+
+def measure(func, uri, spec):
+    """Return (time in seconds, peak memory in bytes) of the resolution"""
+    data = copy.deepcopy(spec)
+    start = time.perf_counter()
+    func(uri, data)
+    elapsed = time.perf_counter() - start
+
+    data = copy.deepcopy(spec)
+    tracemalloc.start()
+    func(uri, data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "specs",
+        nargs="*",
+        default=sorted(glob.glob(os.path.join(root, "specs", "*", "*.yaml"))),
+    )
+    args = parser.parse_args()
+
+    print(
+        f"{'spec':<36} {'legacy s':>9} {'new s':>9} "
+        f"{'legacy MiB':>11} {'new MiB':>9}"
+    )
+    for path in args.specs:
+        path = os.path.abspath(path)
+        spec = os_openapi._get_spec(path, "utf-8")
+        uri = f"file://{path}"
+        old_time, old_mem = measure(legacy_resolve_refs, uri, spec)
+        new_time, new_mem = measure(os_openapi._resolve_refs, uri, spec)
+        print(
+            f"{os.path.relpath(path, root):<36} {old_time:>9.3f} "
+            f"{new_time:>9.3f} {old_mem / 2**20:>11.1f} "
+            f"{new_mem / 2**20:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
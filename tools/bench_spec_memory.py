@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark memory of the parsed and normalized specs.
+
+Compares memory held by the parsed spec together with the normalized
+read-only spec with the previous implementation, which kept a separate string
+object for every key and value of the spec and a ``__dict__`` slot in
+every container of the normalized spec.
+
+Usage::
+
+    python tools/bench_spec_memory.py [SPEC ...]
+
+By default all specs under ``specs/`` are processed.
+"""
+
+import argparse
+import copy
+import gc
+import glob
+import os
+import sys
+import tracemalloc
+
+# Run from the checkout without installing the package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import os_openapi  # noqa: E402
+
+
+class LegacyFrozenDict(dict):
+    """Previous ``os_openapi._FrozenDict`` without ``__slots__``"""
+
+
+class LegacyFrozenList(list):
+    """Previous ``os_openapi._FrozenList`` without ``__slots__``"""
+
+
+def legacy_freeze(node, frozen=None):
+    """Previous implementation of ``os_openapi._freeze``"""
+    if frozen is None:
+        frozen = {}
+    if not isinstance(node, (dict, list)):
+        return node
+    if id(node) in frozen:
+        return frozen[id(node)]
+    if isinstance(node, dict):
+        result = LegacyFrozenDict(
+            (k, legacy_freeze(v, frozen)) for k, v in node.items()
+        )
+    else:
+        result = LegacyFrozenList(legacy_freeze(v, frozen) for v in node)
+    frozen[id(node)] = result
+    return result
+
+
+def measure(func, *args):
+    """Return (result, memory in bytes held by the result)"""
+    gc.collect()
+    tracemalloc.start()
+    result = func(*args)
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size
+
+
+def load(data, uri, intern, freeze):
+    """Parse and normalize the spec like the extension does
+
+    :returns: tuple of the parsed and the normalized spec, which are both
+        kept in memory by the extension
+    """
+    spec = intern(os_openapi._load_spec(data, "utf-8"))
+    normalized = copy.deepcopy(spec)
+    os_openapi.normalize_spec(normalized, uri=uri)
+    return spec, freeze(normalized)
+
+
+def main():
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "specs",
+        nargs="*",
+        default=sorted(glob.glob(os.path.join(root, "specs", "*", "*.yaml"))),
+    )
+    args = parser.parse_args()
+
+    print(f"{'spec':<36} {'legacy MiB':>11} {'new MiB':>9} {'saved':>6}")
+    for path in args.specs:
+        path = os.path.abspath(path)
+        with open(path, "rb") as stream:
+            data = stream.read()
+        uri = f"file://{path}"
+        _, old_size = measure(load, data, uri, lambda x: x, legacy_freeze)
+        _, new_size = measure(
+            load, data, uri, os_openapi._intern_spec, os_openapi._freeze
+        )
+        print(
+            f"{os.path.relpath(path, root):<36} {old_size / 2**20:>11.1f} "
+            f"{new_size / 2**20:>9.1f} {1 - new_size / old_size:>6.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Benchmark rendering of the specs with the openapi directive.
+
+Every spec is rendered in a fresh process by a Sphinx project holding a
+single ``openapi`` directive, so that no cache of a previous spec is
+reused. Time and peak RSS are reported per phase:
+
+- ``load``: YAML load (``_get_spec``)
+- ``resolve``: ref resolution (``_resolve_refs``)
+- ``normalize``: normalization (``_get_normalized_spec``)
+- ``nodes``: node generation (``OpenApiDirective.run``)
+- ``markdown``: Markdown parsing (``_append_markdown_content``)
+- ``html``: HTML writing (``StandaloneHTMLBuilder.write_doc``)
+- ``pickle``: pickling of the doctree and of the operation nodes
+  (``Builder.write_doctree``, ``_save_node_cache``)
+- ``unpickle``: unpickling of the doctree and of the operation nodes
+  (``BuildEnvironment.get_doctree``, ``_load_node_cache``)
+
+Times are exclusive, i.e. time of the nested phases (Markdown parsing
+during node generation) is not counted twice. Peak RSS is the peak RSS
+of the process at the end of the phase.
+
+Usage::
+
+    python tools/bench_specs.py [--output results.json]
+        [--baseline baseline.json] [--threshold 0.2] [SPEC ...]
+
+By default all specs under ``specs/`` are processed. With ``--baseline``
+phases slower (or using more memory) than the stored baseline by more
+than the threshold are flagged and the exit code is 1.
+"""
+
+import argparse
+import functools
+import glob
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+PHASES = (
+    "load",
+    "resolve",
+    "normalize",
+    "nodes",
+    "markdown",
+    "html",
+    "pickle",
+    "unpickle",
+)
+
+# Time differences below this are considered noise (seconds)
+TIME_NOISE = 0.05
+
+
+class PhaseTimer:
+    """Collect exclusive time and peak RSS of the instrumented phases"""
+
+    def __init__(self):
+        self.phases = {}
+        # Time spent in the nested phases of every active phase
+        self._nested = []
+
+    def wrap(self, name, func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            self._nested.append(0.0)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                nested = self._nested.pop()
+                if self._nested:
+                    self._nested[-1] += elapsed
+                phase = self.phases.setdefault(
+                    name, {"calls": 0, "time": 0.0, "peak_rss_kib": 0}
+                )
+                phase["calls"] += 1
+                phase["time"] += elapsed - nested
+                phase["peak_rss_kib"] = max(
+                    phase["peak_rss_kib"],
+                    resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                )
+
+        return wrapper
+
+
+def run_single(path):
+    """Render a single spec and return the phase measurements"""
+    from sphinx.application import Sphinx
+    from sphinx.builders import Builder
+    from sphinx.builders.html import StandaloneHTMLBuilder
+    from sphinx.environment import BuildEnvironment
+
+    import os_openapi
+
+    timer = PhaseTimer()
+    for attr, name in [
+        ("_get_spec", "load"),
+        ("_resolve_refs", "resolve"),
+        ("_get_normalized_spec", "normalize"),
+        ("_save_node_cache", "pickle"),
+        ("_load_node_cache", "unpickle"),
+    ]:
+        setattr(os_openapi, attr, timer.wrap(name, getattr(os_openapi, attr)))
+    directive = os_openapi.OpenApiDirective
+    directive.run = timer.wrap("nodes", directive.run)
+    directive._append_markdown_content = timer.wrap(
+        "markdown", directive._append_markdown_content
+    )
+    StandaloneHTMLBuilder.write_doc = timer.wrap(
+        "html", StandaloneHTMLBuilder.write_doc
+    )
+    Builder.write_doctree = timer.wrap("pickle", Builder.write_doctree)
+    BuildEnvironment.get_doctree = timer.wrap(
+        "unpickle", BuildEnvironment.get_doctree
+    )
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        srcdir = os.path.join(tmpdir, "source")
+        os.makedirs(srcdir)
+        with open(os.path.join(srcdir, "conf.py"), "w") as fp:
+            fp.write('extensions = ["os_openapi"]\n')
+        with open(os.path.join(srcdir, "index.rst"), "w") as fp:
+            fp.write(
+                "Benchmark\n=========\n\n"
+                f".. openapi:: {os.path.relpath(path, srcdir)}\n"
+            )
+        start = time.perf_counter()
+        app = Sphinx(
+            srcdir,
+            srcdir,
+            os.path.join(tmpdir, "html"),
+            os.path.join(tmpdir, "doctrees"),
+            "html",
+            status=None,
+            warning=None,
+        )
+        app.build()
+        total = time.perf_counter() - start
+
+    return {
+        "total": total,
+        "peak_rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "phases": timer.phases,
+    }
+
+
+def compare(results, baseline, threshold):
+    """Return the list of regressions of the results against baseline"""
+    regressions = []
+    for spec, result in results.items():
+        base = baseline.get(spec)
+        if not base:
+            continue
+        for name, phase in result["phases"].items():
+            base_phase = base["phases"].get(name)
+            if not base_phase:
+                continue
+            if (
+                phase["time"] > base_phase["time"] * (1 + threshold)
+                and phase["time"] - base_phase["time"] > TIME_NOISE
+            ):
+                regressions.append(
+                    f"{spec} {name}: time {base_phase['time']:.3f}s -> "
+                    f"{phase['time']:.3f}s"
+                )
+            if phase["peak_rss_kib"] > base_phase["peak_rss_kib"] * (
+                1 + threshold
+            ):
+                regressions.append(
+                    f"{spec} {name}: peak RSS "
+                    f"{base_phase['peak_rss_kib'] / 1024:.1f} MiB -> "
+                    f"{phase['peak_rss_kib'] / 1024:.1f} MiB"
+                )
+    return regressions
+
+
+def main():
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "specs",
+        nargs="*",
+        default=sorted(glob.glob(os.path.join(root, "specs", "*", "*.yaml"))),
+    )
+    parser.add_argument("--output", help="Save results as JSON")
+    parser.add_argument("--baseline", help="Compare with stored results")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="Relative increase considered a regression",
+    )
+    parser.add_argument("--single", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single:
+        json.dump(run_single(args.single), sys.stdout)
+        return 0
+
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [root, env.get("PYTHONPATH")])
+    )
+    print(
+        f"{'spec':<36} {'phase':<10} {'calls':>6} {'time s':>8} "
+        f"{'peak MiB':>9}"
+    )
+    results = {}
+    for path in args.specs:
+        path = os.path.abspath(path)
+        name = os.path.relpath(path, root)
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--single", path],
+            env=env,
+            check=True,
+            stdout=subprocess.PIPE,
+        ).stdout
+        result = results[name] = json.loads(output)
+        for phase_name in PHASES:
+            phase = result["phases"].get(phase_name)
+            if not phase:
+                continue
+            print(
+                f"{name:<36} {phase_name:<10} {phase['calls']:>6} "
+                f"{phase['time']:>8.3f} {phase['peak_rss_kib'] / 1024:>9.1f}"
+            )
+        print(
+            f"{name:<36} {'total':<10} {'':>6} {result['total']:>8.3f} "
+            f"{result['peak_rss_kib'] / 1024:>9.1f}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as fp:
+            json.dump(results, fp, indent=2, sort_keys=True)
+
+    if args.baseline:
+        with open(args.baseline) as fp:
+            regressions = compare(results, json.load(fp), args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
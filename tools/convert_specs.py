@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Convert the YAML specs into JSON specs loaded faster by the extension.
+
+The JSON spec is written next to the YAML spec (``v2.96.yaml`` ->
+``v2.96.json``) and is used by ``os_openapi`` instead of parsing the YAML
+spec as long as it is newer than the YAML spec. Symlinked specs share the
+JSON spec of the file they point to.
+
+Usage::
+
+    python tools/convert_specs.py [SPEC ...]
+
+By default all specs under ``specs/`` are converted.
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+
+# Run from the checkout without installing the package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import os_openapi  # noqa: E402
+
+
+def main():
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "specs",
+        nargs="*",
+        default=sorted(glob.glob(os.path.join(root, "specs", "*", "*.yaml"))),
+    )
+    args = parser.parse_args()
+
+    failed = False
+    for path in sorted({os.path.realpath(x) for x in args.specs}):
+        with open(path, "rb") as stream:
+            data = stream.read()
+        start = time.perf_counter()
+        spec = os_openapi._load_spec(data, "utf-8")
+        yaml_time = time.perf_counter() - start
+
+        try:
+            payload = json.dumps(spec, separators=(",", ":"))
+        except TypeError as ex:
+            # e.g. timestamps have no JSON representation
+            print(f"{path}: cannot be converted: {ex}", file=sys.stderr)
+            failed = True
+            continue
+        dest = os_openapi._get_spec_json_path(path)
+        os_openapi._write_atomic(dest, payload, "wt")
+
+        start = time.perf_counter()
+        with open(dest, "rb") as stream:
+            json.load(stream)
+        json_time = time.perf_counter() - start
+        print(
+            f"{os.path.relpath(dest, root):<36} YAML {yaml_time:.3f}s "
+            f"JSON {json_time:.3f}s"
+        )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())